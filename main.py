@@ -0,0 +1,205 @@
+"""
+Command line entry point for the prize bond analysis.
+
+    python main.py features anomalies top5
+    python main.py --window 5 features predict
+    python main.py top5 --positions
+
+Options may come before, between or after the commands.
+
+Commands run in the order given and share one in-process feature
+pipeline, so the raw data is loaded and each feature stage computed at
+most once per invocation. Heavy libraries (scikit-learn, scipy,
+matplotlib/seaborn) are only imported by the commands that use them.
+"""
+
+import argparse
+import sys
+import time
+
+DEFAULT_WINDOW = 10
+
+
+class Session:
+    """
+    Frames shared by every command of one invocation, computed on first use
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW, data_path=None, use_disk: bool = True,
+                 compact: bool = False):
+        self.window = window
+        self.data_path = data_path
+        self.use_disk = use_disk
+        self.compact = compact
+        self._pipeline = None
+
+    @property
+    def pipeline(self):
+        if self._pipeline is None:
+            from src.features.pipeline import FeaturePipeline, get_pipeline
+
+            if self.data_path is None and self.use_disk:
+                self._pipeline = get_pipeline(window=self.window)
+            else:
+                kwargs = {"data_path": self.data_path} if self.data_path else {}
+                self._pipeline = FeaturePipeline(window=self.window, use_disk=self.use_disk, **kwargs)
+        return self._pipeline
+
+    def raw(self):
+        return self.pipeline.run("load")
+
+    def clean(self):
+        return self.pipeline.run("clean")
+
+    def transition(self):
+        return self.pipeline.run("transition")
+
+    def features(self):
+        return self.pipeline.run("compact" if self.compact else "anomaly")
+
+    def digits(self):
+        return self.pipeline.run("digits")
+
+
+# =========================================================
+# Commands
+# =========================================================
+
+def cmd_clean(session: Session, args) -> None:
+    from src.data.save import PROCESSED_PATH, save_clean_data
+    from src.data.validate import validate_schema
+
+    validate_schema(session.raw())
+    df = session.clean()
+    save_clean_data(df)
+    print(f"Cleaned {len(df)} draws -> {PROCESSED_PATH}")
+
+
+def cmd_features(session: Session, args) -> None:
+    from src.features.combined_features import save_feature_table
+
+    df = session.features()
+    save_feature_table(df)
+    print(f"Feature table: {df.shape[0]} draws x {df.shape[1]} columns -> outputs/prizebond_features.csv")
+
+
+def cmd_anomalies(session: Session, args) -> None:
+    df = session.features()
+    anomalies = df[df["is_anomaly"] == 1].sort_values(by="surprise_zscore", key=abs, ascending=False)
+    print(f"=== Top {args.top_n} Anomalies ({len(anomalies)} flagged) ===")
+    print(anomalies[[
+        "draw_no", "draw_date", "first_prize",
+        "transition_surprise", "surprise_zscore",
+    ]].head(args.top_n).to_string(index=False))
+
+
+def cmd_predict(session: Session, args) -> None:
+    from src.features import predict_next
+    predict_next.main(session.features(), window=session.window)
+
+
+def cmd_predict_full(session: Session, args) -> None:
+    from src.features import predict_next_full
+    predict_next_full.main(session.digits())
+
+
+def cmd_top5_full(session: Session, args) -> None:
+    from src.features import predict_next_full_top5
+    predict_next_full_top5.main(session.digits())
+
+
+def cmd_top5(session: Session, args) -> None:
+    from src.features import predict_next_top5
+    predict_next_top5.main(session.transition(), positions=args.positions, markov=args.markov)
+
+
+def cmd_city(session: Session, args) -> None:
+    from src.experiments import city_analysis
+    city_analysis.main(session.raw())
+
+
+def cmd_city_digits(session: Session, args) -> None:
+    from src.experiments import city_digit_analysis_advanced
+    city_digit_analysis_advanced.main(session.raw())
+
+
+def cmd_plots(session: Session, args) -> None:
+    from src.features import visualize_features
+    visualize_features.main(session.features(), window=session.window)
+
+
+def cmd_report(session: Session, args) -> None:
+    from src.features.visualizations.report import REPORT_DIR, build_report
+    paths = build_report(session.features(), window=session.window, out_dir=REPORT_DIR)
+    print(f"Report: {len(paths)} files -> {REPORT_DIR}")
+
+
+COMMANDS = {
+    "clean": (cmd_clean, "validate and clean the raw draws, save data/processed/draws_clean.csv"),
+    "features": (cmd_features, "build the rolling/transition/anomaly feature table and save it"),
+    "anomalies": (cmd_anomalies, "list the most extreme transition-surprise anomalies"),
+    "predict": (cmd_predict, "random-forest prediction of the next draw's numbers"),
+    "predict-full": (cmd_predict_full, "digit-model prediction of the next first prize"),
+    "top5": (cmd_top5, "top 5 next last digits per prize from digit transitions"),
+    "top5-full": (cmd_top5_full, "digit-model top 5 first prizes for the next draw"),
+    "city": (cmd_city, "city-wise randomness analysis"),
+    "city-digits": (cmd_city_digits, "city-wise last-digit counts, chi-square and transitions"),
+    "plots": (cmd_plots, "feature plots and summary statistics"),
+    "report": (cmd_report, "render every figure to outputs/report/ without a display"),
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    epilog = "commands:\n" + "\n".join(f"  {name:<14}{help_}" for name, (_, help_) in COMMANDS.items())
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="Rs 750 prize bond analysis. Runs one or more commands in a single process.",
+        epilog=epilog,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("commands", nargs="+", choices=list(COMMANDS), metavar="command",
+                        help="commands to run, in order")
+    parser.add_argument("--window", type=int, default=DEFAULT_WINDOW, help="rolling window (default: 10)")
+    parser.add_argument("--data", default=None, help="raw draws CSV (default: data/raw/prize_bond_750.csv)")
+    parser.add_argument("--top-n", type=int, default=10, help="rows shown by `anomalies` (default: 10)")
+    parser.add_argument("--positions", action="store_true",
+                        help="`top5` also ranks the digits at every position (d1-d6)")
+    parser.add_argument("--markov", action="store_true",
+                        help="`top5` also ranks last digits with order 1-3 Markov models")
+    parser.add_argument("--no-cache", action="store_true", help="do not read or write the on-disk feature cache")
+    parser.add_argument("--compact", action="store_true",
+                        help="use the compact feature table (small dtypes, aliased generic columns)")
+    parser.add_argument("--profile", default=None, metavar="DIR",
+                        help="write a stage profiling report to DIR (default with the switches below: outputs/profiles)")
+    parser.add_argument("--profile-cprofile", action="store_true", help="also dump a cProfile file per stage")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="also record each stage's peak traced memory (tracemalloc)")
+    parser.add_argument("--timing", action="store_true", help="print the wall time of each command")
+    return parser
+
+
+def main(argv=None) -> None:
+    args = build_parser().parse_intermixed_args(argv)
+
+    profile = bool(args.profile or args.profile_cprofile or args.profile_memory)
+    if profile:
+        from src.utils.profiling import PROFILE_DIR, enable_profiling
+        enable_profiling(args.profile or PROFILE_DIR, cprofile=args.profile_cprofile,
+                         memory=args.profile_memory)
+
+    session = Session(window=args.window, data_path=args.data, use_disk=not args.no_cache,
+                      compact=args.compact)
+    for name in args.commands:
+        start = time.perf_counter()
+        if profile:
+            from src.utils.profiling import profile_stage
+            with profile_stage(name):
+                COMMANDS[name][0](session, args)
+        else:
+            COMMANDS[name][0](session, args)
+        if args.timing:
+            print(f"[{name}] {time.perf_counter() - start:.2f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
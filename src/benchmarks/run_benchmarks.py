@@ -0,0 +1,347 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.benchmarks.synthetic import generate_draws, write_draws
+from src.data.clean import clean_data
+from src.data.load import PRIZE_COLS
+from src.features.anomaly_features import add_anomaly_features
+from src.features.combined_features import build_feature_table
+from src.features.digit_features import add_digit_features
+from src.features.feature_store import code_version
+from src.features.pipeline import add_digit_stage_features, add_finalized_anomaly_features
+from src.features.predict_next import predict_next_draw
+from src.features.predict_next_full import predict_first_prize_number
+from src.features.predict_next_full_top5 import predict_top5_numbers
+from src.features.predict_next_top5 import predict_top5_last_digits
+from src.features.predict_next_top5_visual import generate_full_candidates, predict_next_last_digits
+from src.features.rolling_features import add_rolling_features
+from src.features.schema import compact_feature_table
+from src.features.transition_features import add_transition_features
+from src.models.registry import ModelRegistry
+
+SIZES = (100, 10_000, 100_000)
+LARGE_SIZES = (1_000_000, 10_000_000)  # added by --large
+WINDOW = 10
+BENCHMARK_DIR = Path("outputs") / "benchmarks"
+TOLERANCE = 1.25  # slowdown ratio reported as a regression
+
+
+# =========================================================
+# Benchmark inputs: every pipeline stage of one synthetic history,
+# built lazily (untimed) and shared by all cases of that size
+# =========================================================
+
+# Stage each input is built from, in pipeline order
+STAGE_INPUTS = {
+    "raw": None,
+    "clean": "raw",
+    "rolling": "clean",
+    "transition": "rolling",
+    "anomaly": "transition",
+    "digits": "anomaly",
+    "csv": None,
+}
+
+
+class BenchmarkInputs:
+    def __init__(self, n_draws: int, workdir: Path, window: int = WINDOW, seed: int = 0):
+        self.n_draws = n_draws
+        self.workdir = Path(workdir)
+        self.window = window
+        self.seed = seed
+        self._frames = {}
+
+    def get(self, name: str):
+        if name not in self._frames:
+            self._frames[name] = getattr(self, f"_{name}")()
+        return self._frames[name]
+
+    def release(self, needed) -> None:
+        """
+        Drops every built stage that neither the `needed` stages nor the
+        builds of the missing ones will read
+        """
+        keep = set()
+        for name in needed:
+            while name is not None and name not in keep:
+                keep.add(name)
+                if name in self._frames:
+                    break
+                name = STAGE_INPUTS[name]
+        for name in list(self._frames):
+            if name not in keep:
+                del self._frames[name]
+
+    def _raw(self):
+        return generate_draws(self.n_draws, seed=self.seed)
+
+    def _csv(self):
+        path = self.workdir / f"draws_{self.n_draws}.csv"
+        write_draws(path, self.n_draws, seed=self.seed)
+        return path
+
+    def _clean(self):
+        return clean_data(self.get("raw"))
+
+    def _rolling(self):
+        return add_rolling_features(self.get("clean"), window=self.window)
+
+    def _transition(self):
+        return add_transition_features(self.get("rolling"))
+
+    def _anomaly(self):
+        return add_finalized_anomaly_features(self.get("transition"), window=self.window)
+
+    def _digits(self):
+        return add_digit_stage_features(self.get("anomaly"))
+
+
+# =========================================================
+# Cases: (input stage, function of that input, largest size to run)
+# =========================================================
+
+def _clean_data(df, inputs):
+    return clean_data(df)
+
+
+def _rolling_features(df, inputs):
+    return add_rolling_features(df, window=inputs.window)
+
+
+def _transition_features(df, inputs):
+    return add_transition_features(df)
+
+
+def _anomaly_features(df, inputs):
+    return add_anomaly_features(df, window=inputs.window)
+
+
+def _digit_features(df, inputs):
+    return add_digit_features(df)
+
+
+def _compact_feature_table(df, inputs):
+    return compact_feature_table(df, window=inputs.window)
+
+
+def _build_feature_table(path, inputs):
+    return build_feature_table(window=inputs.window, data_path=path)
+
+
+def _predict_next(df, inputs):
+    return predict_next_draw(df, window=inputs.window)
+
+
+def _predict_next_top5(df, inputs):
+    return [predict_top5_last_digits(df, prize_col=col, top_n=5) for col in PRIZE_COLS]
+
+
+def _predict_next_top5_visual(df, inputs):
+    results = []
+    for col in PRIZE_COLS:
+        top_digits, _ = predict_next_last_digits(df, col)
+        results.append(generate_full_candidates(df, col, top_digits))
+    return results
+
+
+def _fresh_registry(inputs):
+    return ModelRegistry(cache_dir=Path(tempfile.mkdtemp(dir=inputs.workdir)))
+
+
+def _predict_next_full(df, inputs):
+    return predict_first_prize_number(df, registry=_fresh_registry(inputs))
+
+
+def _predict_next_full_top5(df, inputs):
+    return predict_top5_numbers(df, registry=_fresh_registry(inputs))
+
+
+CASES = {
+    "clean_data": ("raw", _clean_data, None),
+    "add_rolling_features": ("clean", _rolling_features, None),
+    "add_transition_features": ("rolling", _transition_features, None),
+    "add_anomaly_features": ("transition", _anomaly_features, None),
+    "add_digit_features": ("anomaly", _digit_features, None),
+    "compact_feature_table": ("digits", _compact_feature_table, None),
+    "build_feature_table": ("csv", _build_feature_table, None),
+    # Model training grows much faster than the feature stages
+    "predict_next": ("anomaly", _predict_next, 100_000),
+    "predict_next_top5": ("transition", _predict_next_top5, None),
+    "predict_next_top5_visual": ("anomaly", _predict_next_top5_visual, None),
+    "predict_next_full": ("digits", _predict_next_full, 10_000),
+    "predict_next_full_top5": ("digits", _predict_next_full_top5, 10_000),
+}
+
+# Cases that train models are timed once per size and get no memory pass
+MODEL_CASES = {"predict_next", "predict_next_full", "predict_next_full_top5"}
+
+
+# =========================================================
+# Measurement
+# =========================================================
+
+def _call(func, data, inputs):
+    if isinstance(data, pd.DataFrame):
+        data = data.copy(deep=False)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(data, inputs)
+
+
+def measure(func, data, inputs, repeats: int = 1, memory: bool = True) -> dict:
+    """
+    Wall time of `repeats` calls, then peak traced memory of one more call
+    """
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        _call(func, data, inputs)
+        times.append(time.perf_counter() - start)
+
+    result = {
+        "repeats": repeats,
+        "seconds_min": min(times),
+        "seconds_median": statistics.median(times),
+    }
+    if memory:
+        tracemalloc.start()
+        try:
+            _call(func, data, inputs)
+            result["peak_mb"] = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def run_benchmarks(sizes=SIZES, cases=None, repeats: int = None, memory: bool = True,
+                   window: int = WINDOW, seed: int = 0, verbose: bool = True) -> dict:
+    """
+    Runs every case at every size on synthetic histories and returns a
+    JSON-serialisable report. Cases run from a scratch directory so
+    `outputs/` files written by the pipeline do not touch the project.
+    They run grouped by input stage, in pipeline order, and each stage
+    frame is released once no remaining case needs it.
+    """
+    cases = list(CASES) if cases is None else list(cases)
+    stage_order = list(STAGE_INPUTS)
+    cases.sort(key=lambda name: stage_order.index(CASES[name][0]))
+    results = []
+    cwd = os.getcwd()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        scratch = Path(scratch)
+        (scratch / "outputs").mkdir()
+        os.chdir(scratch)
+        try:
+            for n_draws in sizes:
+                inputs = BenchmarkInputs(n_draws, scratch, window=window, seed=seed)
+                n_repeats = repeats or (5 if n_draws <= 10_000 else 1)
+
+                runnable = [name for name in cases
+                            if CASES[name][2] is None or n_draws <= CASES[name][2]]
+                for name in cases:
+                    stage, func, max_draws = CASES[name]
+                    if name not in runnable:
+                        if verbose:
+                            print(f"{name:<26} {n_draws:>10,}  skipped (> {max_draws:,} draws)")
+                        continue
+
+                    is_model = name in MODEL_CASES
+                    case_repeats = 1 if is_model and repeats is None else n_repeats
+                    row = {"case": name, "n_draws": n_draws}
+                    row.update(measure(func, inputs.get(stage), inputs, case_repeats,
+                                       memory and not is_model))
+                    results.append(row)
+                    if verbose:
+                        peak = f"{row['peak_mb']:10.2f} MB" if "peak_mb" in row else ""
+                        print(f"{name:<26} {n_draws:>10,} {row['seconds_min']:10.4f} s {peak}")
+
+                    remaining = runnable[runnable.index(name) + 1:]
+                    inputs.release(CASES[later][0] for later in remaining)
+                del inputs
+        finally:
+            os.chdir(cwd)
+
+    return {"meta": environment(window, seed), "results": results}
+
+
+def environment(window: int, seed: int) -> dict:
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "code_version": code_version(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "window": window,
+        "seed": seed,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float = TOLERANCE) -> pd.DataFrame:
+    """
+    Joins two reports on (case, n_draws). A case is a regression when its
+    best time or peak memory grew by more than `tolerance`.
+    """
+    cur = pd.DataFrame(current["results"]).set_index(["case", "n_draws"])
+    base = pd.DataFrame(baseline["results"]).set_index(["case", "n_draws"])
+    joined = cur.join(base, how="inner", lsuffix="", rsuffix="_baseline")
+
+    joined["time_ratio"] = joined["seconds_min"] / joined["seconds_min_baseline"]
+    regression = joined["time_ratio"] > tolerance
+    if "peak_mb" in joined and "peak_mb_baseline" in joined:
+        joined["memory_ratio"] = joined["peak_mb"] / joined["peak_mb_baseline"]
+        regression |= joined["memory_ratio"] > tolerance
+    joined["regression"] = regression
+    return joined.reset_index()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every pipeline stage on synthetic draw histories")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES),
+                        help="numbers of draws (default: 100 10000 100000)")
+    parser.add_argument("--large", action="store_true", help="also run 10^6 and 10^7 draws")
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=None, help="cases to run")
+    parser.add_argument("--repeats", type=int, default=None, help="timed calls per case (default: 5 up to 10^4 draws, else 1)")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="skip the tracemalloc peak-memory pass (never run for model cases)")
+    parser.add_argument("--out", default=None, help="report path (default: outputs/benchmarks/<timestamp>.json)")
+    parser.add_argument("--compare", default=None, help="baseline report to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="slowdown ratio counted as a regression")
+    args = parser.parse_args(argv)
+
+    sizes = args.sizes + [n for n in LARGE_SIZES if n not in args.sizes] if args.large else args.sizes
+    report = run_benchmarks(sizes, args.cases, args.repeats, memory=not args.no_memory)
+
+    out = Path(args.out) if args.out else BENCHMARK_DIR / f"{report['meta']['timestamp'].replace(':', '')}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nReport written to {out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        table = compare(report, baseline, args.tolerance)
+        print("\n=== Comparison with baseline ===")
+        print(table.to_string(index=False))
+        if table["regression"].any():
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+CITIES = [
+    "Bahawalpur", "Faisalabad", "Gujranwala", "Hyderabad", "Islamabad",
+    "Karachi", "Lahore", "Multan", "Muzaffarabad", "Peshawar",
+    "Quetta", "Rawalpindi", "Sialkot", "Sukkur",
+]
+
+# pandas datetime64[ns] covers roughly 1677-2262; long histories reuse dates
+FIRST_DATE = pd.Timestamp("1700-01-01")
+LAST_DATE = pd.Timestamp("2260-12-31")
+
+
+def generate_draws(n_draws: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Synthetic draw history with the raw CSV schema as read by `load_raw_data`
+    (Draw No., 1st, 2nd, 2nd.1, 2nd.2, City, Date as dd-mm-yyyy strings).
+    Numbers are uniform over 000000-999999. Draws are spread evenly over
+    the representable date range, newest first; dates repeat once there
+    are more draws than days.
+    """
+    rng = np.random.default_rng(seed)
+    numbers = rng.integers(0, 1_000_000, size=(n_draws, 4))
+
+    n_days = (LAST_DATE - FIRST_DATE).days + 1
+    if n_draws <= 1:
+        day = np.zeros(n_draws, dtype=np.int64)
+    else:
+        day = np.arange(n_draws, dtype=np.int64) * (n_days - 1) // (n_draws - 1)
+    day = day[::-1]
+
+    # Format each distinct date once and gather, instead of n_draws strftime calls
+    unique_days, inverse = np.unique(day, return_inverse=True)
+    labels = (FIRST_DATE + pd.to_timedelta(unique_days, unit="D")).strftime("%d-%m-%Y")
+    dates = np.asarray(labels, dtype=object)[inverse]
+
+    return pd.DataFrame({
+        "Draw No.": np.arange(n_draws, 0, -1),
+        "1st": numbers[:, 0],
+        "2nd": numbers[:, 1],
+        "2nd.1": numbers[:, 2],
+        "2nd.2": numbers[:, 3],
+        "City": np.asarray(CITIES, dtype=object)[rng.integers(0, len(CITIES), size=n_draws)],
+        "Date": dates,
+    })
+
+
+def write_draws(path, n_draws: int, seed: int = 0) -> None:
+    """
+    Writes a synthetic history as a raw CSV with the original duplicate
+    "2nd" headers
+    """
+    df = generate_draws(n_draws, seed=seed)
+    df.columns = ["Draw No.", "1st", "2nd", "2nd", "2nd", "City", "Date"]
+    df.to_csv(path, index=False)
@@ -6,9 +6,7 @@ def clean_data(df: pd.DataFrame) -> pd.DataFrame:
     Returns a new DataFrame (does not modify input).
     """
 
-    df = df.copy()
-
-    # 1. Rename columns to Python-safe names
+    # 1. Rename columns to Python-safe names (a new frame; the input is untouched)
     df = df.rename(columns={
         "Draw No.": "draw_no",
         "1st": "first_prize",
@@ -16,7 +14,8 @@ def clean_data(df: pd.DataFrame) -> pd.DataFrame:
         "2nd.1": "second_prize_2",
         "2nd.2": "second_prize_3",
         "Date": "draw_date",
-        "City": "city"
+        "City": "city",
+        "Denomination": "denomination"
     })
 
     # 2. Convert date to datetime
@@ -5,15 +5,134 @@ from pathlib import Path
 # Get project root directory (PrizeBond750Analysis)
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 
-DATA_PATH = PROJECT_ROOT / "data" / "raw" / "prize_bond_750.csv"
+RAW_DATA_DIR = PROJECT_ROOT / "data" / "raw"
 
+DATA_PATH = RAW_DATA_DIR / "prize_bond_750.csv"
 
-def load_raw_data() -> pd.DataFrame:
+# Compact dtypes for the raw schema; duplicate "2nd" headers are mangled
+# to "2nd.1" / "2nd.2" by read_csv
+RAW_DTYPES = {
+    "Draw No.": "int32",
+    "1st": "int32",
+    "2nd": "int32",
+    "2nd.1": "int32",
+    "2nd.2": "int32",
+    "City": "category",
+}
+
+CHUNK_SIZE = 100_000
+
+# Prize number columns of a cleaned draw table, in prize order
+PRIZE_COLS = ["first_prize", "second_prize_1", "second_prize_2", "second_prize_3"]
+
+
+def load_raw_data(path: Path = DATA_PATH) -> pd.DataFrame:
     """
     Loads raw prize bond dataset without any modification.
     """
-    if not DATA_PATH.exists():
-        raise FileNotFoundError(f"Dataset not found at {DATA_PATH}")
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Dataset not found at {path}")
+
+    df = pd.read_csv(path)
+    return df
+
+
+def denomination_path(denomination) -> Path:
+    """
+    Raw CSV for a bond denomination, e.g. 750 -> data/raw/prize_bond_750.csv
+    """
+    return RAW_DATA_DIR / f"prize_bond_{denomination}.csv"
+
+
+def _resolve_sources(sources) -> list:
+    """
+    Normalises a denomination, a path, or a list of either to
+    [(denomination label, path)]
+    """
+    if isinstance(sources, (str, Path, int)):
+        sources = [sources]
+
+    resolved = []
+    for source in sources:
+        if isinstance(source, int) or (isinstance(source, str) and source.isdigit()):
+            label, path = str(source), denomination_path(source)
+        else:
+            path = Path(source)
+            label = path.stem.replace("prize_bond_", "")
+        if not path.exists():
+            raise FileNotFoundError(f"Dataset not found at {path}")
+        resolved.append((label, path))
+    return resolved
+
+
+def iter_raw_chunks(sources=750, chunksize: int = CHUNK_SIZE, validate: bool = True,
+                    clean: bool = True):
+    """
+    Streams one or more raw prize bond CSVs in chunks of `chunksize` rows.
+
+    Numbers are read as int32, City as categorical and Date is parsed
+    (day first). Each chunk gets a "Denomination" column, is validated with
+    `validate_schema` and, when `clean` is set, passed through `clean_data`.
+    Sorting applies within a chunk. Draw numbers must be strictly monotonic
+    through each file (`validate_draw_run`), which also rejects a number
+    repeated in a later chunk while keeping only the last one.
+    """
+    from src.data.validate import validate_draw_run, validate_schema
+    from src.data.clean import clean_data
+
+    for label, path in _resolve_sources(sources):
+        reader = pd.read_csv(path, dtype=RAW_DTYPES, chunksize=chunksize)
+        last, step = None, 0
+        for chunk in reader:
+            chunk["Date"] = pd.to_datetime(chunk["Date"], dayfirst=True, errors="coerce")
+            chunk["Denomination"] = pd.Categorical([label] * len(chunk))
+
+            if validate:
+                validate_schema(chunk)
+                try:
+                    last, step = validate_draw_run(chunk["Draw No."].to_numpy(), last, step)
+                except AssertionError as e:
+                    raise AssertionError(f"{e} in {path}") from None
+            if clean:
+                chunk = clean_data(chunk)
+            yield chunk
+
+
+def load_dataset(sources=750, chunksize: int = CHUNK_SIZE, iterator: bool = False,
+                 validate: bool = True, clean: bool = True):
+    """
+    Loads one or more denominations (or CSV paths) with compact dtypes.
+
+    Returns an iterator of chunks when `iterator` is set, otherwise the
+    concatenated frame. A concatenated cleaned frame is sorted newest first
+    across all chunks, like `clean_data`, and its draw numbers are then
+    checked per denomination with `validate_draw_numbers`.
+    """
+    from src.data.validate import validate_draw_numbers
+
+    chunks = iter_raw_chunks(sources, chunksize=chunksize, validate=validate, clean=clean)
+    if iterator:
+        return chunks
+
+    frames = list(chunks)
+    if not frames:
+        return pd.DataFrame()
+    df = pd.concat(frames, ignore_index=True)
+
+    draw_col, city_col, date_col, denom_col = (
+        ("draw_no", "city", "draw_date", "denomination") if clean
+        else ("Draw No.", "City", "Date", "Denomination")
+    )
+    # Per-chunk categories differ, so concat falls back to object dtype
+    df[city_col] = df[city_col].astype("category")
+    df[denom_col] = df[denom_col].astype("category")
+
+    if clean:
+        df = df.sort_values(date_col, ascending=False, kind="stable").reset_index(drop=True)
 
-    df = pd.read_csv(DATA_PATH)
+    if validate:
+        ordered = df if clean else df.sort_values(date_col, ascending=False, kind="stable")
+        for _, draw_nos in ordered.groupby(denom_col, observed=True)[draw_col]:
+            validate_draw_numbers(draw_nos)
     return df
@@ -0,0 +1,282 @@
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.data.load import PRIZE_COLS
+
+NUMBER_SPACE = 1_000_000  # six-digit bond numbers 000000-999999
+COMPACT_THRESHOLD = 65_536  # postings kept in the append log before a rebuild
+
+INDEX_DIR = Path("outputs") / "number_index"
+
+# Main postings, CSR layout: postings of number n are rows offsets[n]:offsets[n + 1]
+MAIN_ARRAYS = ("counts", "offsets", "draw_no", "draw_date", "prize")
+# Postings appended since the last rebuild, sorted by number
+DELTA_ARRAYS = ("delta_number", "delta_draw_no", "delta_draw_date", "delta_prize")
+
+
+def _postings(df: pd.DataFrame, prize_cols=PRIZE_COLS) -> dict:
+    """
+    One posting per (draw, prize column), sorted by winning number
+    """
+    numbers = df[prize_cols].to_numpy(dtype=np.int64)
+    if numbers.size and (numbers.min() < 0 or numbers.max() >= NUMBER_SPACE):
+        raise ValueError(f"Winning numbers must lie in [0, {NUMBER_SPACE})")
+
+    n_prizes = len(prize_cols)
+    number = numbers.ravel()
+    draw_no = np.repeat(df["draw_no"].to_numpy(dtype=np.int32), n_prizes)
+    draw_date = np.repeat(df["draw_date"].to_numpy(dtype="datetime64[ns]").view(np.int64), n_prizes)
+    prize = np.tile(np.arange(n_prizes, dtype=np.uint8), len(df))
+
+    order = np.argsort(number, kind="stable")
+    return {
+        "number": number[order],
+        "draw_no": draw_no[order],
+        "draw_date": draw_date[order],
+        "prize": prize[order],
+    }
+
+
+class WinningNumberIndex:
+    """
+    Index over the six-digit number space of every (draw, prize) win.
+
+    - counts: dense int32 array with one slot per possible number
+    - offsets/draw_no/draw_date/prize: CSR postings pointing back to the draw
+      and prize column of each win
+    - delta_*: wins appended since the last rebuild, kept sorted by number
+
+    Arrays are memory-mapped from `path`. Point lookups are O(1) plus a
+    binary search in the append log; range counts are O(1) via offsets.
+    `counts` is derived data: it is written after the postings and rebuilt
+    from them on open if an interrupted write left it out of step.
+    """
+
+    def __init__(self, path: Path, prize_cols=PRIZE_COLS):
+        self.path = Path(path)
+        self.prize_cols = list(prize_cols)
+        self._open()
+
+    # ---------------- storage ----------------
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, path: Path = INDEX_DIR, prize_cols=PRIZE_COLS):
+        """
+        Builds the index from a cleaned draw table and writes it to `path`
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        cls._write(path, _postings(df, prize_cols), _postings(df.iloc[:0], prize_cols), prize_cols)
+        return cls(path, prize_cols)
+
+    @staticmethod
+    def _write(path: Path, main: dict, delta: dict, prize_cols) -> None:
+        counts = np.bincount(main["number"], minlength=NUMBER_SPACE).astype(np.int32)
+        counts += np.bincount(delta["number"], minlength=NUMBER_SPACE).astype(np.int32)
+        offsets = np.zeros(NUMBER_SPACE + 1, dtype=np.int64)
+        np.cumsum(np.bincount(main["number"], minlength=NUMBER_SPACE), out=offsets[1:])
+
+        arrays = {
+            "counts": counts,
+            "offsets": offsets,
+            "draw_no": main["draw_no"],
+            "draw_date": main["draw_date"],
+            "prize": main["prize"],
+        }
+        arrays.update({f"delta_{key}": value for key, value in delta.items()})
+
+        for name, values in arrays.items():
+            tmp = path / f"{name}.tmp.npy"
+            np.save(tmp, values)
+            os.replace(tmp, path / f"{name}.npy")
+        with open(path / "meta.json", "w") as f:
+            json.dump({"prize_cols": list(prize_cols), "number_space": NUMBER_SPACE}, f)
+
+    def _open(self) -> None:
+        self.counts = np.load(self.path / "counts.npy", mmap_mode="r+")
+        for name in MAIN_ARRAYS[1:]:
+            setattr(self, name, np.load(self.path / f"{name}.npy", mmap_mode="r"))
+        for name in DELTA_ARRAYS:
+            setattr(self, name, np.load(self.path / f"{name}.npy"))
+
+        if int(self.counts.sum(dtype=np.int64)) != len(self.draw_no) + len(self.delta_number):
+            self.counts[:] = np.diff(self.offsets) + np.bincount(self.delta_number, minlength=NUMBER_SPACE)
+            self.counts.flush()
+
+    def draw_numbers(self) -> np.ndarray:
+        """
+        Sorted unique draw numbers in the index
+        """
+        return np.unique(np.concatenate([self.draw_no, self.delta_draw_no]))
+
+    # ---------------- queries ----------------
+
+    def count(self, number) -> np.ndarray:
+        """
+        Number of wins for one number or an array of numbers
+        """
+        return np.asarray(self.counts[np.asarray(number)])
+
+    def has_won(self, number) -> np.ndarray:
+        return self.count(number) > 0
+
+    def range_count(self, low: int, high: int) -> int:
+        """
+        Wins with low <= number <= high
+        """
+        main = int(self.offsets[high + 1] - self.offsets[low])
+        d_start = np.searchsorted(self.delta_number, low, side="left")
+        d_stop = np.searchsorted(self.delta_number, high, side="right")
+        return main + int(d_stop - d_start)
+
+    def lookup(self, number: int) -> pd.DataFrame:
+        """
+        Every win of `number`: draw number, draw date and prize column
+        """
+        return self.range_lookup(number, number)
+
+    def range_lookup(self, low: int, high: int) -> pd.DataFrame:
+        """
+        Every win with low <= number <= high, ordered by number
+        """
+        start, stop = int(self.offsets[low]), int(self.offsets[high + 1])
+        main_numbers = np.repeat(
+            np.arange(low, high + 1), np.diff(self.offsets[low:high + 2])
+        )
+        d_start = np.searchsorted(self.delta_number, low, side="left")
+        d_stop = np.searchsorted(self.delta_number, high, side="right")
+
+        number = np.concatenate([main_numbers, self.delta_number[d_start:d_stop]])
+        draw_no = np.concatenate([self.draw_no[start:stop], self.delta_draw_no[d_start:d_stop]])
+        draw_date = np.concatenate([self.draw_date[start:stop], self.delta_draw_date[d_start:d_stop]])
+        prize = np.concatenate([self.prize[start:stop], self.delta_prize[d_start:d_stop]])
+
+        order = np.argsort(number, kind="stable")
+        return pd.DataFrame({
+            "number": number[order],
+            "draw_no": draw_no[order],
+            "draw_date": draw_date[order].view("datetime64[ns]"),
+            "prize": np.array(self.prize_cols)[prize[order]],
+        })
+
+    def repeats(self, min_count: int = 2) -> pd.DataFrame:
+        """
+        Numbers that have won at least `min_count` times
+        """
+        numbers = np.flatnonzero(np.asarray(self.counts) >= min_count)
+        return pd.DataFrame({"number": numbers, "count": np.asarray(self.counts)[numbers]})
+
+    # ---------------- updates ----------------
+
+    def append(self, df: pd.DataFrame) -> None:
+        """
+        Adds the wins of newly published draws. Postings go to the sorted
+        append log, which is merged into the main postings once it exceeds
+        COMPACT_THRESHOLD entries; counts are updated in place afterwards.
+        Raises ValueError for a draw number that is already indexed.
+        """
+        draw_nos = df["draw_no"].to_numpy()
+        repeated = np.isin(draw_nos, self.draw_numbers()) | pd.Series(draw_nos).duplicated().to_numpy()
+        if repeated.any():
+            raise ValueError(f"Draws already indexed: {sorted(set(draw_nos[repeated].tolist()))}")
+
+        new = _postings(df, self.prize_cols)
+        delta = {key: getattr(self, f"delta_{key}") for key in new}
+        merged = {key: np.concatenate([delta[key], new[key]]) for key in new}
+        order = np.argsort(merged["number"], kind="stable")
+        merged = {key: value[order] for key, value in merged.items()}
+
+        if len(merged["number"]) > COMPACT_THRESHOLD:
+            self.compact(merged)
+            return
+
+        for key, values in merged.items():
+            tmp = self.path / f"delta_{key}.tmp.npy"
+            np.save(tmp, values)
+            os.replace(tmp, self.path / f"delta_{key}.npy")
+            setattr(self, f"delta_{key}", values)
+        np.add.at(self.counts, new["number"], 1)
+        self.counts.flush()
+
+    def compact(self, delta: dict = None) -> None:
+        """
+        Rebuilds the CSR postings with the append log folded in
+        """
+        if delta is None:
+            delta = {key: getattr(self, f"delta_{key}")
+                     for key in ("number", "draw_no", "draw_date", "prize")}
+
+        main_number = np.repeat(np.arange(NUMBER_SPACE), np.diff(self.offsets))
+        merged = {
+            "number": np.concatenate([main_number, delta["number"]]),
+            "draw_no": np.concatenate([self.draw_no, delta["draw_no"]]),
+            "draw_date": np.concatenate([self.draw_date, delta["draw_date"]]),
+            "prize": np.concatenate([self.prize, delta["prize"]]),
+        }
+        order = np.argsort(merged["number"], kind="stable")
+        merged = {key: value[order] for key, value in merged.items()}
+        empty = {key: value[:0] for key, value in merged.items()}
+
+        del self.counts
+        self._write(self.path, merged, empty, self.prize_cols)
+        self._open()
+
+    @classmethod
+    def open(cls, path: Path = INDEX_DIR) -> "WinningNumberIndex":
+        with open(Path(path) / "meta.json") as f:
+            meta = json.load(f)
+        return cls(path, meta["prize_cols"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build and query the winning-number index")
+    parser.add_argument("--index", default=str(INDEX_DIR), help="index directory (default: outputs/number_index)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="build the index from a raw draws CSV")
+    build.add_argument("--data", default=None, help="raw draws CSV (default: data/raw/prize_bond_750.csv)")
+    append = commands.add_parser("append", help="add newly published draws from a raw draws CSV")
+    append.add_argument("data", help="raw draws CSV")
+    lookup = commands.add_parser("lookup", help="every win of one or more numbers")
+    lookup.add_argument("numbers", type=int, nargs="+")
+    range_ = commands.add_parser("range", help="wins with LOW <= number <= HIGH")
+    range_.add_argument("low", type=int)
+    range_.add_argument("high", type=int)
+    repeats = commands.add_parser("repeats", help="numbers that have won more than once")
+    repeats.add_argument("--min-count", type=int, default=2)
+    commands.add_parser("compact", help="fold the append log into the main postings")
+    args = parser.parse_args(argv)
+
+    from src.data.clean import clean_data
+    from src.data.load import DATA_PATH, load_raw_data
+
+    if args.command == "build":
+        index = WinningNumberIndex.build(clean_data(load_raw_data(args.data or DATA_PATH)), args.index)
+        print(f"Indexed {len(index.draw_no)} wins -> {args.index}", file=sys.stderr)
+        return
+
+    index = WinningNumberIndex.open(args.index)
+    if args.command == "append":
+        df = clean_data(load_raw_data(args.data))
+        index.append(df)
+        print(f"Appended {len(df)} draws", file=sys.stderr)
+    elif args.command == "compact":
+        index.compact()
+    elif args.command == "lookup":
+        result = pd.concat([index.lookup(n) for n in args.numbers], ignore_index=True)
+        result.to_csv(sys.stdout, index=False)
+    elif args.command == "range":
+        index.range_lookup(args.low, args.high).to_csv(sys.stdout, index=False)
+        print(f"{index.range_count(args.low, args.high)} wins", file=sys.stderr)
+    elif args.command == "repeats":
+        index.repeats(args.min_count).to_csv(sys.stdout, index=False)
+
+
+if __name__ == "__main__":
+    main()
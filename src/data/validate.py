@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 
@@ -37,3 +38,36 @@ def validate_schema(df: pd.DataFrame) -> None:
     for col in prize_columns:
         assert pd.api.types.is_integer_dtype(df[col]), \
             f"Column {col} must be integer type"
+
+
+def validate_draw_numbers(draw_nos: pd.Series) -> None:
+    """
+    Validates the draw numbers of one denomination, ordered newest first.
+    Run it on the whole column: a chunk only sees its own draws.
+    Raises AssertionError if they are duplicated or out of date order.
+    """
+    assert draw_nos.is_unique, "Duplicate draw numbers found"
+    assert draw_nos.is_monotonic_decreasing, \
+        "Draw numbers do not increase with the draw date"
+
+
+def validate_draw_run(draw_nos, last: int = None, step: int = 0) -> tuple:
+    """
+    Validates the draw numbers of one chunk of a raw file, which must be
+    strictly monotonic in file order across all of its chunks. `last` and
+    `step` carry the previous chunk's last draw number and the direction,
+    so streaming a file keeps O(1) state. Returns (last, step) for the
+    next chunk. Raises AssertionError on a repeated or out-of-order number.
+    """
+    draw_nos = np.asarray(draw_nos, dtype=np.int64)
+    if last is not None:
+        draw_nos = np.concatenate([[last], draw_nos])
+    if len(draw_nos) == 0:
+        return last, step
+
+    diffs = np.sign(np.diff(draw_nos))
+    assert (diffs != 0).all(), "Duplicate draw numbers found"
+    if step == 0 and len(diffs):
+        step = int(diffs[0])
+    assert (diffs == step).all(), "Draw numbers are not in file order"
+    return int(draw_nos[-1]), step
@@ -0,0 +1,243 @@
+import argparse
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.data.load import PRIZE_COLS
+
+NUMBER_SPACE = 1_000_000
+CHUNK_SIZE = 1_000_000
+NUMBER_COLUMN = "bond_number"
+PART_BYTES = 64 << 20  # largest slice of a holdings file handed to one worker
+
+
+class WinMatcher:
+    """
+    Matches bond numbers against every historical winning number.
+
+    Winning numbers are flattened into one sorted array with parallel
+    arrays for draw number, date, city and prize tier. A dense bitmap over
+    the number space rejects non-winners in O(1); only hits are resolved
+    with `searchsorted`.
+    """
+
+    def __init__(self, draws: pd.DataFrame, prize_cols=PRIZE_COLS):
+        n_prizes = len(prize_cols)
+        numbers = draws[prize_cols].to_numpy(dtype=np.int64).ravel()
+        order = np.argsort(numbers, kind="stable")
+
+        self.numbers = numbers[order]
+        self.draw_no = np.repeat(draws["draw_no"].to_numpy(), n_prizes)[order]
+        self.draw_date = np.repeat(draws["draw_date"].to_numpy(), n_prizes)[order]
+        self.city = np.repeat(draws["city"].to_numpy(dtype=object), n_prizes)[order]
+        self.prize = np.tile(np.array(prize_cols, dtype=object), len(draws))[order]
+
+        self.winning = np.zeros(NUMBER_SPACE, dtype=bool)
+        in_space = (self.numbers >= 0) & (self.numbers < NUMBER_SPACE)
+        self.winning[self.numbers[in_space]] = True
+
+    def match_numbers(self, numbers) -> tuple:
+        """
+        Returns (holding positions, winning-posting positions), one pair per
+        (holding, win) match.
+        """
+        numbers = np.asarray(numbers, dtype=np.int64)
+        in_space = (numbers >= 0) & (numbers < NUMBER_SPACE)
+        hit = np.zeros(len(numbers), dtype=bool)
+        hit[in_space] = self.winning[numbers[in_space]]
+        rows = np.flatnonzero(hit)
+
+        left = np.searchsorted(self.numbers, numbers[rows], side="left")
+        counts = np.searchsorted(self.numbers, numbers[rows], side="right") - left
+
+        # Expand each hit to all of its wins
+        total = int(counts.sum())
+        first = np.repeat(np.cumsum(counts) - counts, counts)
+        postings = np.repeat(left, counts) + (np.arange(total) - first)
+        return np.repeat(rows, counts), postings
+
+    def match(self, holdings, number_col: str = NUMBER_COLUMN) -> pd.DataFrame:
+        """
+        Matches an array of bond numbers or a holdings frame. For a frame,
+        all holdings columns are kept on each matched row. Adds draw_no,
+        draw_date, city and prize.
+        """
+        if isinstance(holdings, pd.DataFrame):
+            frame = holdings.reset_index(drop=True)
+            numbers = frame[number_col].to_numpy()
+        else:
+            numbers = np.asarray(holdings)
+            frame = pd.DataFrame({number_col: numbers})
+
+        rows, postings = self.match_numbers(numbers)
+        result = frame.iloc[rows].reset_index(drop=True)
+        result["draw_no"] = self.draw_no[postings]
+        result["draw_date"] = self.draw_date[postings]
+        result["city"] = self.city[postings]
+        result["prize"] = self.prize[postings]
+        return result
+
+    def match_file(self, path, number_col: str = NUMBER_COLUMN, chunksize: int = CHUNK_SIZE,
+                   part: tuple = None):
+        """
+        Streams a holdings CSV in chunks and yields (rows read, matches) per chunk.
+        Without a header row, the first column holds the numbers and is
+        named `number_col`. `part` is a (start, stop) byte range from
+        `file_parts`; by default the whole file is read.
+        """
+        names, data_start = holdings_layout(path, number_col)
+        start, stop = part if part is not None else (data_start, os.path.getsize(path))
+        if stop <= start:
+            return
+
+        with open(path, "rb") as f:
+            f.seek(start)
+            source = f if part is None else io.BytesIO(f.read(stop - start))
+            reader = pd.read_csv(source, header=None, names=names, chunksize=chunksize,
+                                 dtype={number_col: np.int64})
+            for chunk in reader:
+                yield len(chunk), self.match(chunk, number_col=number_col)
+
+
+def holdings_layout(path, number_col: str = NUMBER_COLUMN) -> tuple:
+    """
+    Returns (column names, byte offset of the first data row) of a holdings
+    CSV. The first row is a header unless it names no `number_col` and
+    starts with a number. Without a header, or when the header has no
+    `number_col`, the first column is named `number_col`.
+    """
+    with open(path, "rb") as f:
+        first = f.readline()
+    if not first.strip():
+        return [number_col], len(first)
+
+    row = pd.read_csv(io.BytesIO(first), header=None, dtype=str).iloc[0].fillna("").str.strip()
+    names = list(row)
+    if number_col not in names and row.iloc[0].isdigit():
+        return [number_col] + [f"column_{i}" for i in range(1, len(names))], 0
+
+    if number_col not in names:
+        names[0] = number_col
+    return names, len(first)
+
+
+def file_parts(path, start: int = 0, part_bytes: int = PART_BYTES) -> list:
+    """
+    Splits the bytes of `path` from `start` into (start, stop) ranges of
+    about `part_bytes` that begin and end on line boundaries
+    """
+    size = os.path.getsize(path)
+    bounds = [start]
+    with open(path, "rb") as f:
+        while bounds[-1] + part_bytes < size:
+            f.seek(bounds[-1] + part_bytes)
+            f.readline()
+            if f.tell() >= size:
+                break
+            bounds.append(f.tell())
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def default_draws() -> pd.DataFrame:
+    from src.data.load import load_raw_data
+    from src.data.clean import clean_data
+
+    return clean_data(load_raw_data())
+
+
+# =========================================================
+# Multi-file / multi-core driver
+# =========================================================
+
+_WORKER = {}
+
+
+def _init_worker(draws, number_col, chunksize):
+    _WORKER.update(
+        matcher=WinMatcher(draws),
+        number_col=number_col,
+        chunksize=chunksize,
+    )
+
+
+def _check_part(task) -> tuple:
+    path, part = task
+    matcher = _WORKER["matcher"]
+    n_rows, frames = 0, []
+    for n_chunk, matches in matcher.match_file(path, _WORKER["number_col"], _WORKER["chunksize"],
+                                               part=part):
+        n_rows += n_chunk
+        frames.append(matches)
+    # Empty chunks are dropped: their object columns would widen the dtypes of the rest
+    matches = pd.concat([m for m in frames if len(m)] or frames[:1] or [pd.DataFrame()],
+                        ignore_index=True)
+    matches.insert(0, "holdings_file", str(path))
+    return n_rows, matches
+
+
+def check_holdings(paths, draws: pd.DataFrame = None, number_col: str = NUMBER_COLUMN,
+                   chunksize: int = CHUNK_SIZE, n_jobs: int = None) -> tuple:
+    """
+    Checks every holdings file against the draw history. Each file is cut
+    into line-aligned byte ranges (at most PART_BYTES, and no more than
+    one per worker for smaller files) which are spread over `n_jobs`
+    worker processes, so one large file also uses every core. Matches
+    keep the file order. Returns (total rows checked, matches).
+    """
+    draws = default_draws() if draws is None else draws
+    n_jobs = n_jobs or os.cpu_count() or 1
+
+    tasks = []
+    for path in paths:
+        _, data_start = holdings_layout(path, number_col)
+        data_bytes = os.path.getsize(path) - data_start
+        part_bytes = min(PART_BYTES, max(1, -(-data_bytes // n_jobs)))
+        tasks += [(path, part) for part in file_parts(path, data_start, part_bytes)]
+    n_jobs = min(n_jobs, max(1, len(tasks)))
+
+    if n_jobs == 1:
+        _init_worker(draws, number_col, chunksize)
+        results = [_check_part(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker,
+                                 initargs=(draws, number_col, chunksize)) as executor:
+            results = list(executor.map(_check_part, tasks))
+
+    total = sum(n for n, _ in results)
+    frames = [m for _, m in results if len(m)]
+    matches = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    return total, matches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check bond holdings against every prize bond draw")
+    parser.add_argument("holdings", nargs="+", help="holdings CSV file(s)")
+    parser.add_argument("--number-col", default=NUMBER_COLUMN, help="column with bond numbers")
+    parser.add_argument("--chunksize", type=int, default=CHUNK_SIZE, help="rows per chunk")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--out", default=None, help="write matches to this CSV instead of stdout")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    total, matches = check_holdings(args.holdings, number_col=args.number_col,
+                                    chunksize=args.chunksize, n_jobs=args.jobs)
+    elapsed = time.perf_counter() - start
+
+    if args.out:
+        matches.to_csv(args.out, index=False)
+    else:
+        matches.to_csv(sys.stdout, index=False)
+
+    rate = total / elapsed / 1e6 if elapsed > 0 else float("inf")
+    print(f"Checked {total} numbers, {len(matches)} matches in {elapsed:.2f}s "
+          f"({rate:.1f}M numbers/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
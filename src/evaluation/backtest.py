@@ -0,0 +1,226 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+
+from src.data.load import PRIZE_COLS
+from src.features.combined_features import compute_feature_table
+from src.features.digit_features import add_digit_features
+from src.features.predict_next import build_features_for_prize
+from src.features.transition_features import (
+    build_transition_tensor,
+    transition_probability_matrix,
+)
+from src.models.registry import DIGIT_MODEL_PARAMS
+from src.models.votes import digit_vote_distribution, tree_votes
+
+LOG_LOSS_EPS = 1e-15
+
+BASE_COLS = [
+    "draw_no", "draw_date", "city",
+    "first_prize", "second_prize_1",
+    "second_prize_2", "second_prize_3",
+]
+
+# Same model as predict_next.train_model
+REGRESSOR_PARAMS = {"n_estimators": 100, "random_state": 42}
+
+
+# =========================================================
+# Predictors
+# Each takes the chronological training draws and the feature table built
+# from them in the same order (oldest draw first), so every feature of row j
+# only looks at draws up to j, and returns
+# {prize: probabilities of the next draw's last digit 0-9}.
+# =========================================================
+
+def training_pairs(table: pd.DataFrame, feature_cols: list, target_col: str):
+    """
+    Features of row j with the target of row j + 1, the next draw, for all
+    but the newest row, and the newest row as the query.
+    Returns (X, y, X_query).
+    """
+    X = table[feature_cols].iloc[:-1]
+    y = table[target_col].iloc[1:].to_numpy()
+    X_query = table[feature_cols].iloc[[-1]]
+    return X, y, X_query
+
+
+def predict_transition(train: pd.DataFrame, table: pd.DataFrame, window: int) -> dict:
+    """
+    predict_next_top5: last-digit transition probabilities from the latest draw
+    """
+    values = train[PRIZE_COLS].to_numpy()
+    prob_tensor = transition_probability_matrix(build_transition_tensor(values))
+    last_digits = values[-1] % 10
+    return {
+        col: prob_tensor[i, last_digits[i]]
+        for i, col in enumerate(PRIZE_COLS)
+    }
+
+
+def predict_regressor(train: pd.DataFrame, table: pd.DataFrame, window: int) -> dict:
+    """
+    predict_next: RandomForest on the prize value; tree votes give a
+    distribution over the predicted last digit
+    """
+    probs = {}
+    for col in PRIZE_COLS:
+        X, y, X_query = training_pairs(table, build_features_for_prize(table, col, window), col)
+        model = RandomForestRegressor(**REGRESSOR_PARAMS, n_jobs=1).fit(X, y)
+
+        votes = np.round(tree_votes(model, X_query)[0]).astype(np.int64) % 10
+        probs[col] = np.bincount(votes, minlength=10) / len(votes)
+    return probs
+
+
+def predict_digits(train: pd.DataFrame, table: pd.DataFrame, window: int) -> dict:
+    """
+    predict_next_full: RandomForest on the last digit position (d6) of each prize
+    """
+    feature_cols = [col for col in table.columns if col not in BASE_COLS]
+
+    probs = {}
+    for col in PRIZE_COLS:
+        X, y, X_query = training_pairs(table, feature_cols, f"{col}_d6")
+        model = RandomForestRegressor(**DIGIT_MODEL_PARAMS, n_jobs=1).fit(X, y)
+        probs[col] = digit_vote_distribution([model], X_query)[0, 0]
+    return probs
+
+
+PREDICTORS = {
+    "predict_next": predict_regressor,
+    "predict_next_top5": predict_transition,
+    "predict_next_full": predict_digits,
+}
+
+
+# =========================================================
+# Walk-forward engine
+# =========================================================
+
+_WORKER = {}
+
+
+def build_fold_table(train: pd.DataFrame, window: int) -> pd.DataFrame:
+    """
+    Feature table of a fold's chronological training draws, in the same
+    order. The newest-first table of build_feature_table computes rolling
+    windows and the previous digit from newer draws, which for a training
+    row includes the draw it is paired with as the target. Transition
+    probabilities likewise come from prefix counts, so no training row sees
+    the transition into its own target.
+    """
+    return compute_feature_table(train.reset_index(drop=True), window=window, prefix_transitions=True)
+
+
+def _init_worker(history, window, train_size, predictors, top_k):
+    _WORKER.update(
+        history=history,
+        window=window,
+        train_size=train_size,
+        predictors=predictors,
+        top_k=top_k,
+    )
+
+
+def _evaluate_fold(cutoff: int) -> list:
+    history = _WORKER["history"]
+    window = _WORKER["window"]
+    train_size = _WORKER["train_size"]
+
+    start = 0 if train_size is None else max(0, cutoff - train_size)
+    train = history.iloc[start:cutoff].reset_index(drop=True)
+    actual = history.iloc[cutoff]
+
+    # Features are built once per fold, oldest draw first so that rolling
+    # windows and previous-draw columns look back in time, and shared by
+    # every predictor
+    table = add_digit_features(build_fold_table(train, window))
+
+    rows = []
+    for name in _WORKER["predictors"]:
+        probs = PREDICTORS[name](train, table, window)
+        for col in PRIZE_COLS:
+            p = np.asarray(probs[col], dtype=float)
+            true_digit = int(actual[col]) % 10
+            ranking = np.argsort(-p, kind="stable")
+            rank = int(np.flatnonzero(ranking == true_digit)[0])
+
+            row = {
+                "cutoff": cutoff,
+                "draw_no": actual["draw_no"],
+                "predictor": name,
+                "prize": col,
+                "true_last_digit": true_digit,
+                "predicted_last_digit": int(ranking[0]),
+                "log_loss": -np.log(max(p[true_digit], LOG_LOSS_EPS)),
+            }
+            for k in _WORKER["top_k"]:
+                row[f"hit@{k}"] = int(rank < k)
+            rows.append(row)
+    return rows
+
+
+def walk_forward(df: pd.DataFrame, predictors=None, window: int = 10, min_train: int = 30,
+                 train_size: int = None, step: int = 1, top_k=(1, 3, 5), n_jobs: int = None):
+    """
+    Walk-forward backtest of the next-draw predictors on a cleaned draw table.
+
+    At every `step`-th draw after the first `min_train`, features are built
+    from the preceding draws only (expanding window, or the last
+    `train_size` draws when given), each predictor is refitted and its
+    last-digit distribution for the next draw is scored. Folds run in a
+    process pool of `n_jobs` workers (inline when n_jobs == 1).
+
+    Returns (per_fold, summary):
+    - per_fold: one row per fold, predictor and prize column
+    - summary: mean top-k hit rates and log-loss per predictor and prize
+    """
+    predictors = list(PREDICTORS) if predictors is None else list(predictors)
+    unknown = set(predictors) - set(PREDICTORS)
+    if unknown:
+        raise ValueError(f"Unknown predictors: {sorted(unknown)}")
+
+    # Cleaned tables are newest first; walk forward in time
+    history = df.sort_values("draw_date", kind="stable").reset_index(drop=True)
+    history = history[[col for col in BASE_COLS if col in history.columns]]
+    cutoffs = list(range(max(min_train, window + 2), len(history), step))
+    if not cutoffs:
+        raise ValueError("Not enough draws for the requested min_train")
+
+    init_args = (history, window, train_size, predictors, tuple(top_k))
+    n_jobs = n_jobs or os.cpu_count() or 1
+
+    if n_jobs == 1:
+        _init_worker(*init_args)
+        results = [_evaluate_fold(cutoff) for cutoff in cutoffs]
+    else:
+        chunksize = max(1, len(cutoffs) // (4 * n_jobs))
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker,
+                                 initargs=init_args) as executor:
+            results = list(executor.map(_evaluate_fold, cutoffs, chunksize=chunksize))
+
+    per_fold = pd.DataFrame([row for rows in results for row in rows])
+
+    metric_cols = [f"hit@{k}" for k in top_k] + ["log_loss"]
+    summary = per_fold.groupby(["predictor", "prize"])[metric_cols].mean()
+    summary["folds"] = per_fold.groupby(["predictor", "prize"]).size()
+    return per_fold, summary.reset_index()
+
+
+def main():
+    from src.data.load import load_raw_data
+    from src.data.clean import clean_data
+
+    df = clean_data(load_raw_data())
+    _, summary = walk_forward(df, window=10, min_train=30)
+
+    print("\n=== Walk-forward Backtest (next-draw last digit) ===")
+    print(summary.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+from scipy.stats import chi2, norm
+
+RAW_PRIZE_COLUMNS = ["1st", "2nd", "2nd.1", "2nd.2"]
+
+
+class GroupedDraws:
+    """
+    Prize numbers of a draw table flattened draw by draw (like
+    `group[prize_cols].values.flatten()`) and laid out contiguously per
+    group using one stable sort of the group codes. Every statistic is then
+    a bincount over group ids, so the cost does not grow with the number
+    of groups.
+    """
+
+    def __init__(self, df: pd.DataFrame, by="City", prize_cols=RAW_PRIZE_COLUMNS):
+        by = [by] if isinstance(by, str) else list(by)
+        grouper = df.groupby(by, sort=True)
+        codes = grouper.ngroup().fillna(-1).to_numpy(dtype=np.int64)
+        keys = grouper.size().index
+        # Rows with a missing key are dropped, as groupby does
+        kept = np.flatnonzero(codes >= 0)
+        order = kept[np.argsort(codes[kept], kind="stable")]
+
+        self.by = by
+        self.keys = keys.to_frame(index=False)
+        self.n_groups = len(keys)
+        self.draws = np.bincount(codes[kept], minlength=self.n_groups)
+
+        values = df[prize_cols].to_numpy(dtype=float)[order]
+        group = np.repeat(codes[order], len(prize_cols))
+        numbers = values.ravel()
+        valid = ~np.isnan(numbers)
+
+        self.numbers = numbers[valid]
+        self.group = group[valid]
+        self.digits = self.numbers.astype(np.int64) % 10
+        # Adjacent pairs that stay inside one group
+        self.same_group = self.group[1:] == self.group[:-1]
+
+    def count(self) -> np.ndarray:
+        return np.bincount(self.group, minlength=self.n_groups)
+
+    def moments(self):
+        """
+        Mean and population standard deviation per group
+        """
+        n = self.count()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.bincount(self.group, weights=self.numbers, minlength=self.n_groups) / n
+            centered = self.numbers - mean[self.group]
+            var = np.bincount(self.group, weights=centered * centered, minlength=self.n_groups) / n
+        return mean, np.sqrt(var)
+
+    def digit_counts(self) -> np.ndarray:
+        """
+        Last-digit counts, shape (groups, 10)
+        """
+        flat = self.group * 10 + self.digits
+        return np.bincount(flat, minlength=self.n_groups * 10).reshape(self.n_groups, 10)
+
+    def transitions(self) -> np.ndarray:
+        """
+        Last-digit transition counts between consecutive numbers of a group,
+        shape (groups, prev, cur)
+        """
+        flat = self.group[1:] * 100 + self.digits[:-1] * 10 + self.digits[1:]
+        counts = np.bincount(flat[self.same_group], minlength=self.n_groups * 100)
+        return counts.reshape(self.n_groups, 10, 10)
+
+    def runs_test(self):
+        """
+        statsmodels runstest_1samp(x, cutoff="mean", correction=False) per group.
+        Returns (z, p_value).
+        """
+        n = self.count().astype(float)
+        mean, _ = self.moments()
+        above = self.numbers >= mean[self.group]
+
+        changes = (above[1:] != above[:-1]) & self.same_group
+        n_runs = 1 + np.bincount(self.group[1:][changes], minlength=self.n_groups)
+        n_pos = np.bincount(self.group, weights=above, minlength=self.n_groups)
+        npn = n_pos * (n - n_pos)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            r_mean = 2.0 * npn / n + 1
+            r_var = 2.0 * npn * (2.0 * npn - n) / n ** 2 / (n - 1.0)
+            z = (n_runs - r_mean) / np.sqrt(r_var)
+        return z, 2 * norm.sf(np.abs(z))
+
+    def last_digit_chi2(self):
+        """
+        chisquare of last-digit counts against their mean, per group.
+        Returns (statistic, p_value).
+        """
+        counts = self.digit_counts()
+        expected = counts.mean(axis=1, keepdims=True)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            stat = ((counts - expected) ** 2 / expected).sum(axis=1)
+        return stat, chi2.sf(stat, 9)
+
+    def statistics(self) -> pd.DataFrame:
+        """
+        Per-group randomness statistics in one tidy frame: group keys, draw and
+        number counts, moments, runs test, last-digit chi-square and digit counts.
+        """
+        mean, std = self.moments()
+        runs_z, runs_p = self.runs_test()
+        chi_stat, chi_p = self.last_digit_chi2()
+        counts = self.digit_counts()
+
+        result = self.keys.copy()
+        result["Draws"] = self.draws
+        result["Numbers"] = self.count()
+        result["Mean"] = mean
+        result["Std_Dev"] = std
+        result["Runs_Test_z"] = runs_z
+        result["Runs_Test_p"] = runs_p
+        result["Chi2_LastDigit"] = chi_stat
+        result["p_LastDigit"] = chi_p
+        for digit in range(10):
+            result[f"digit_{digit}"] = counts[:, digit]
+        return result
+
+
+def grouped_statistics(df: pd.DataFrame, by="City", prize_cols=RAW_PRIZE_COLUMNS) -> pd.DataFrame:
+    """
+    Per-group randomness statistics in one tidy frame; see GroupedDraws.statistics.
+    """
+    return GroupedDraws(df, by=by, prize_cols=prize_cols).statistics()
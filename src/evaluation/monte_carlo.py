@@ -0,0 +1,183 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.data.load import PRIZE_COLS
+
+NUMBER_LOW = 0
+NUMBER_HIGH = 1_000_000  # exclusive; six-digit bond numbers
+CHUNK_SIZE = 10_000  # replicates per chunk
+
+# statistic -> which tail counts as "at least as extreme"
+STATISTICS = {
+    "number_chi2": "upper",
+    "last_digit_chi2": "upper",
+    "lag1_autocorr": "two-sided",
+    "runs_z": "two-sided",
+}
+
+
+# =========================================================
+# Batched test statistics
+# `draws` has shape (batch, n_draws, n_prizes); every statistic is
+# returned as a (batch,) array, computed the same way as the notebook.
+# =========================================================
+
+def number_chi2(numbers: np.ndarray) -> np.ndarray:
+    """
+    chisquare of per-number frequencies against their mean, over the
+    numbers that occur (np.unique + chisquare in the notebook)
+    """
+    batch, n = numbers.shape
+    ordered = np.sort(numbers, axis=1)
+    new_run = np.ones((batch, n), dtype=bool)
+    new_run[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+    run_id = np.cumsum(new_run, axis=1) - 1
+    n_unique = run_id[:, -1] + 1
+
+    flat = (np.arange(batch)[:, None] * n + run_id).ravel()
+    counts = np.bincount(flat, minlength=batch * n).reshape(batch, n)
+    sum_sq = (counts.astype(float) ** 2).sum(axis=1)
+
+    # sum((c - m)^2 / m) with m = n / n_unique
+    return sum_sq * n_unique / n - n
+
+
+def last_digit_chi2(numbers: np.ndarray) -> np.ndarray:
+    """
+    chisquare of last-digit counts against a uniform expectation
+    """
+    batch, n = numbers.shape
+    flat = (np.arange(batch)[:, None] * 10 + numbers % 10).ravel()
+    counts = np.bincount(flat, minlength=batch * 10).reshape(batch, 10)
+    expected = n / 10
+    return ((counts - expected) ** 2 / expected).sum(axis=1)
+
+
+def lag1_autocorr(series: np.ndarray) -> np.ndarray:
+    """
+    Pearson correlation between x[:-1] and x[1:] for each row
+    """
+    a = series[:, :-1].astype(float)
+    b = series[:, 1:].astype(float)
+    a = a - a.mean(axis=1, keepdims=True)
+    b = b - b.mean(axis=1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (a * b).sum(axis=1) / np.sqrt((a * a).sum(axis=1) * (b * b).sum(axis=1))
+
+
+def runs_z(numbers: np.ndarray, correction: bool = True) -> np.ndarray:
+    """
+    z statistic of statsmodels' runstest_1samp with cutoff = median of each row
+    """
+    n = numbers.shape[1]
+    above = numbers >= np.median(numbers, axis=1, keepdims=True)
+    n_runs = 1 + (above[:, 1:] != above[:, :-1]).sum(axis=1)
+    n_pos = above.sum(axis=1).astype(float)
+    npn = n_pos * (n - n_pos)
+
+    r_mean = 2.0 * npn / n + 1
+    r_var = 2.0 * npn * (2.0 * npn - n) / n ** 2 / (n - 1.0)
+    deviation = n_runs - r_mean
+    if correction and n < 50:
+        deviation = np.where(deviation > 0.5, deviation - 0.5,
+                             np.where(deviation < 0.5, deviation + 0.5, 0.0))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return deviation / np.sqrt(r_var)
+
+
+def batch_statistics(draws: np.ndarray) -> dict:
+    """
+    All notebook test statistics for a batch of draw histories
+    """
+    batch = draws.shape[0]
+    numbers = draws.reshape(batch, -1)
+    return {
+        "number_chi2": number_chi2(numbers),
+        "last_digit_chi2": last_digit_chi2(numbers),
+        "lag1_autocorr": lag1_autocorr(draws[:, :, 0]),
+        "runs_z": runs_z(numbers),
+    }
+
+
+# =========================================================
+# Simulation engine
+# =========================================================
+
+def _simulate_chunk(args) -> dict:
+    seed, size, n_draws, n_prizes, low, high = args
+    rng = np.random.default_rng(seed)
+    draws = rng.integers(low, high, size=(size, n_draws, n_prizes), dtype=np.int32)
+    return batch_statistics(draws)
+
+
+def simulate_null(n_draws: int, n_prizes: int = 4, n_replicates: int = 100_000,
+                  chunk_size: int = CHUNK_SIZE, n_jobs: int = None, seed: int = 0,
+                  low: int = NUMBER_LOW, high: int = NUMBER_HIGH) -> dict:
+    """
+    Simulates uniform draw histories of shape (n_draws, n_prizes) and returns
+    {statistic: (n_replicates,) array}. Replicates are generated in chunks of
+    `chunk_size` to bound memory; chunks are spread over `n_jobs` processes.
+    Each chunk has its own spawned seed, so results do not depend on n_jobs.
+    """
+    sizes = [chunk_size] * (n_replicates // chunk_size)
+    if n_replicates % chunk_size:
+        sizes.append(n_replicates % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(s, size, n_draws, n_prizes, low, high) for s, size in zip(seeds, sizes)]
+
+    n_jobs = n_jobs or os.cpu_count() or 1
+    if n_jobs == 1 or len(tasks) == 1:
+        results = [_simulate_chunk(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            results = list(executor.map(_simulate_chunk, tasks))
+
+    return {
+        name: np.concatenate([r[name] for r in results])
+        for name in STATISTICS
+    }
+
+
+def empirical_p_values(df: pd.DataFrame, n_replicates: int = 100_000, **kwargs) -> pd.DataFrame:
+    """
+    Observed notebook statistics for a cleaned draw table with Monte Carlo
+    p-values from uniform histories of the same shape.
+    p = (1 + #{null at least as extreme}) / (1 + n_replicates)
+    """
+    draws = df[PRIZE_COLS].to_numpy()[None, :, :]
+    observed = {name: values[0] for name, values in batch_statistics(draws).items()}
+    null = simulate_null(draws.shape[1], draws.shape[2], n_replicates, **kwargs)
+
+    rows = []
+    for name, tail in STATISTICS.items():
+        sims = null[name]
+        if tail == "upper":
+            extreme = sims >= observed[name]
+        else:
+            extreme = np.abs(sims) >= abs(observed[name])
+        rows.append({
+            "statistic": name,
+            "observed": observed[name],
+            "null_mean": np.nanmean(sims),
+            "null_std": np.nanstd(sims),
+            "p_value": (1 + extreme.sum()) / (1 + len(sims)),
+        })
+    return pd.DataFrame(rows)
+
+
+def main():
+    from src.data.load import load_raw_data
+    from src.data.clean import clean_data
+
+    df = clean_data(load_raw_data())
+    result = empirical_p_values(df, n_replicates=100_000)
+
+    print("\n=== Monte Carlo Randomness Tests ===")
+    print(result.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,11 @@
 from src.data.load import load_raw_data
+from src.data.clean import clean_data
 from src.features.rolling_features import add_rolling_features
 
 
 def main():
-    df = load_raw_data()
-    df = add_rolling_features(df, column="1st")
+    df = clean_data(load_raw_data())
+    df = add_rolling_features(df, window=10)
 
     print(df.head(15))
     print(df.columns)
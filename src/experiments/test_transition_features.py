@@ -1,14 +1,15 @@
 from src.data.load import load_raw_data
+from src.data.clean import clean_data
 from src.features.transition_features import add_transition_features
 
 
 def main():
-    df = load_raw_data()
-    df = add_transition_features(df, column="1st")
+    df = clean_data(load_raw_data())
+    df = add_transition_features(df)
 
     print(df[[
-        "Draw No.",
-        "1st",
+        "draw_no",
+        "first_prize",
         "last_digit",
         "prev_last_digit",
         "transition_prob",
@@ -0,0 +1,300 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.data.load import PRIZE_COLS
+
+# Detector defaults
+WINDOWS = (10,)
+Z_THRESHOLD = 2.0
+CUSUM_SLACK = 0.5     # k: drift (in standard deviations) tolerated per draw
+CUSUM_LIMIT = 5.0     # h: alarm level of the cumulative sums
+CUSUM_BLOCK = 64      # first block length of the vectorised CUSUM between alarms
+MAX_CUSUM_BLOCK = 65536
+
+STATE_ARRAYS = (
+    "buffer", "pos", "n_seen",
+    "roll_mean", "roll_m2",
+    "ewma_mean", "ewma_var",
+    "cusum_pos", "cusum_neg",
+)
+
+
+class AnomalyEngine:
+    """
+    Online anomaly detectors over the transition surprise of every prize
+    column, run side by side for several window lengths.
+
+    Each observation is one draw: a vector with one surprise per prize
+    column, fed in chronological order (oldest draw first). Per prize and
+    window the engine keeps
+    - Welford moments over the last `w` observations (ring buffer add/remove)
+    - an EWMA mean and variance with alpha = 2 / (w + 1)
+    - a two-sided CUSUM of the EWMA z-score
+    so every update is O(prizes * windows) regardless of history length.
+    NaN surprises (no previous draw) are skipped for that prize.
+
+    A fresh engine is seeded with `seed`, one vectorised pass over the
+    history; draws appended after that go through the per-draw `_step`.
+    """
+
+    def __init__(self, windows=WINDOWS, prize_cols=PRIZE_COLS, threshold: float = Z_THRESHOLD,
+                 cusum_slack: float = CUSUM_SLACK, cusum_limit: float = CUSUM_LIMIT):
+        self.windows = np.asarray(sorted(set(windows)), dtype=np.int64)
+        self.prize_cols = list(prize_cols)
+        self.threshold = threshold
+        self.cusum_slack = cusum_slack
+        self.cusum_limit = cusum_limit
+        self.alpha = 2.0 / (self.windows + 1.0)
+
+        n_prizes, n_windows = len(self.prize_cols), len(self.windows)
+        self.buffer = np.zeros((n_prizes, int(self.windows.max())))
+        self.pos = np.zeros(n_prizes, dtype=np.int64)
+        self.n_seen = np.zeros(n_prizes, dtype=np.int64)
+        self.roll_mean = np.zeros((n_prizes, n_windows))
+        self.roll_m2 = np.zeros((n_prizes, n_windows))
+        self.ewma_mean = np.zeros((n_prizes, n_windows))
+        self.ewma_var = np.zeros((n_prizes, n_windows))
+        self.cusum_pos = np.zeros((n_prizes, n_windows))
+        self.cusum_neg = np.zeros((n_prizes, n_windows))
+
+    # ---------------- updates ----------------
+
+    def _step(self, x: np.ndarray) -> tuple:
+        """
+        Ingests one draw, x of shape (prizes,). Returns rolling z, EWMA z,
+        CUSUM statistic and anomaly flag, each (prizes, windows).
+        """
+        w = self.windows[None, :]
+        valid = ~np.isnan(x)
+        xv = np.where(valid, x, 0.0)[:, None]
+        seen = self.n_seen[:, None]
+
+        # Welford over the last w observations: add x, drop the value leaving the window
+        full = seen >= w
+        x_old = self.buffer[np.arange(len(x))[:, None], (self.pos[:, None] - w) % self.buffer.shape[1]]
+        x_old = np.where(full, x_old, 0.0)
+        n = np.minimum(seen + 1, w)
+        mean = self.roll_mean + np.where(full, xv - x_old, xv - self.roll_mean) / n
+        m2 = self.roll_m2 + np.where(full, (xv - x_old) * (xv - mean + x_old - self.roll_mean),
+                                     (xv - self.roll_mean) * (xv - mean))
+        m2 = np.maximum(m2, 0.0)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            roll_z = (xv - mean) / np.sqrt(m2 / (n - 1))
+            # Predictive EWMA z-score against the state before this draw
+            ewma_z = (xv - self.ewma_mean) / np.sqrt(self.ewma_var)
+        roll_z = np.where(seen + 1 >= w, roll_z, np.nan)
+        ewma_z = np.where((seen > 0) & (self.ewma_var > 0), ewma_z, np.nan)
+
+        delta = xv - self.ewma_mean
+        ewma_mean = np.where(seen > 0, self.ewma_mean + self.alpha * delta, xv)
+        ewma_var = np.where(seen > 0, (1 - self.alpha) * (self.ewma_var + self.alpha * delta ** 2), 0.0)
+
+        drift = np.nan_to_num(ewma_z)
+        cusum_pos = np.maximum(0.0, self.cusum_pos + drift - self.cusum_slack)
+        cusum_neg = np.maximum(0.0, self.cusum_neg - drift - self.cusum_slack)
+        cusum = np.where(cusum_pos >= cusum_neg, cusum_pos, -cusum_neg)
+        alarm = np.maximum(cusum_pos, cusum_neg) > self.cusum_limit
+
+        flag = (np.abs(np.nan_to_num(roll_z)) > self.threshold) \
+            | (np.abs(drift) > self.threshold) | alarm
+
+        # Commit the new state for prizes that had an observation
+        v = valid[:, None]
+        self.roll_mean = np.where(v, mean, self.roll_mean)
+        self.roll_m2 = np.where(v, m2, self.roll_m2)
+        self.ewma_mean = np.where(v, ewma_mean, self.ewma_mean)
+        self.ewma_var = np.where(v, ewma_var, self.ewma_var)
+        self.cusum_pos = np.where(v & ~alarm, cusum_pos, np.where(v, 0.0, self.cusum_pos))
+        self.cusum_neg = np.where(v & ~alarm, cusum_neg, np.where(v, 0.0, self.cusum_neg))
+
+        rows = np.flatnonzero(valid)
+        self.buffer[rows, self.pos[rows]] = x[rows]
+        self.pos[rows] = (self.pos[rows] + 1) % self.buffer.shape[1]
+        self.n_seen[rows] += 1
+
+        nan = np.where(v, 1.0, np.nan)
+        return roll_z * nan, ewma_z * nan, cusum * nan, flag & v
+
+    def update(self, values) -> dict:
+        """
+        Ingests draws in chronological order, values of shape (draws, prizes).
+        Returns {"zscore", "ewma_zscore", "cusum", "is_anomaly"}, each
+        (draws, prizes, windows). A fresh engine is seeded in one pass.
+        """
+        if not self.n_seen.any():
+            return self.seed(values)
+
+        values = np.atleast_2d(np.asarray(values, dtype=float))
+        shape = (len(values), len(self.prize_cols), len(self.windows))
+        out = {
+            "zscore": np.empty(shape),
+            "ewma_zscore": np.empty(shape),
+            "cusum": np.empty(shape),
+            "is_anomaly": np.empty(shape, dtype=bool),
+        }
+        for t, x in enumerate(values):
+            out["zscore"][t], out["ewma_zscore"][t], out["cusum"][t], out["is_anomaly"][t] = self._step(x)
+        return out
+
+    def seed(self, values) -> dict:
+        """
+        Ingests the history of a fresh engine, values of shape (draws, prizes)
+        in chronological order, with whole-array operations per prize and
+        window: rolling moments from pandas `rolling`, the EWMA mean
+        and variance as pandas `ewm` recurrences, and the CUSUM between
+        alarms as cumulative sums. Output and final state are those of
+        feeding the draws to `_step` one by one, up to rounding.
+        """
+        if self.n_seen.any():
+            raise ValueError("seed needs a fresh engine; use update for appended draws")
+
+        values = np.atleast_2d(np.asarray(values, dtype=float))
+        shape = (len(values), len(self.prize_cols), len(self.windows))
+        out = {
+            "zscore": np.full(shape, np.nan),
+            "ewma_zscore": np.full(shape, np.nan),
+            "cusum": np.full(shape, np.nan),
+            "is_anomaly": np.zeros(shape, dtype=bool),
+        }
+        size = self.buffer.shape[1]
+
+        for i in range(len(self.prize_cols)):
+            rows = np.flatnonzero(~np.isnan(values[:, i]))
+            x = values[rows, i]
+            n_obs = len(x)
+            if n_obs == 0:
+                continue
+            series = pd.Series(x)
+
+            for j, w in enumerate(self.windows):
+                # Rolling z-score once the window is full
+                rolling = series.rolling(int(w), min_periods=1)
+                mean, std = rolling.mean().to_numpy(), rolling.std().to_numpy()
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    roll_z = (x - mean) / std
+                roll_z[:w - 1] = np.nan
+
+                # EWMA: mean_t = mean_{t-1} + a * delta_t and
+                # var_t = (1 - a) * var_{t-1} + a * (1 - a) * delta_t ** 2
+                a = self.alpha[j]
+                ewma_mean = series.ewm(alpha=a, adjust=False).mean().to_numpy()
+                delta = x - np.concatenate([x[:1], ewma_mean[:-1]])
+                ewma_var = pd.Series((1 - a) * delta ** 2).ewm(alpha=a, adjust=False).mean().to_numpy()
+                prev_var = np.concatenate([[0.0], ewma_var[:-1]])
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    ewma_z = np.where(prev_var > 0, delta / np.sqrt(prev_var), np.nan)
+
+                drift = np.nan_to_num(ewma_z)
+                cusum_pos, cusum_neg, alarm = self._cusum(drift, i, j)
+
+                out["zscore"][rows, i, j] = roll_z
+                out["ewma_zscore"][rows, i, j] = ewma_z
+                out["cusum"][rows, i, j] = np.where(cusum_pos >= cusum_neg, cusum_pos, -cusum_neg)
+                out["is_anomaly"][rows, i, j] = (np.abs(np.nan_to_num(roll_z)) > self.threshold) \
+                    | (np.abs(drift) > self.threshold) | alarm
+
+                n = min(n_obs, w)
+                self.roll_mean[i, j] = mean[-1]
+                self.roll_m2[i, j] = std[-1] ** 2 * (n - 1) if n > 1 else 0.0
+                self.ewma_mean[i, j] = ewma_mean[-1]
+                self.ewma_var[i, j] = ewma_var[-1]
+
+            kept = np.arange(max(0, n_obs - size), n_obs)
+            self.buffer[i, kept % size] = x[kept]
+            self.pos[i] = n_obs % size
+            self.n_seen[i] = n_obs
+
+        return out
+
+    def _cusum(self, drift: np.ndarray, i: int, j: int) -> tuple:
+        """
+        Two-sided CUSUM of `drift` for prize i and window j, starting from
+        and leaving the engine state. Returns the (pre-reset) upper and
+        lower sums and the alarm flags per draw.
+
+        Between alarms S_t = max(0, S_{t-1} + y_t) equals C_t minus the
+        running minimum of (-S_0, C_1, ..., C_t), where C is the cumulative
+        sum of y from the block start. Blocks start at CUSUM_BLOCK draws and
+        double while no alarm fires; an alarm resets both sums and restarts
+        the block after it.
+        """
+        n = len(drift)
+        upper, lower = np.empty(n), np.empty(n)
+        pos, neg = self.cusum_pos[i, j], self.cusum_neg[i, j]
+        start, block = 0, CUSUM_BLOCK
+        while start < n:
+            d = drift[start:start + block]
+            up = np.cumsum(d - self.cusum_slack)
+            down = np.cumsum(-d - self.cusum_slack)
+            up -= np.minimum(np.minimum.accumulate(up), -pos)
+            down -= np.minimum(np.minimum.accumulate(down), -neg)
+
+            alarms = np.flatnonzero(np.maximum(up, down) > self.cusum_limit)
+            stop = alarms[0] + 1 if len(alarms) else len(d)
+            upper[start:start + stop], lower[start:start + stop] = up[:stop], down[:stop]
+            if len(alarms):
+                pos, neg, block = 0.0, 0.0, CUSUM_BLOCK
+            else:
+                pos, neg, block = up[-1], down[-1], min(2 * block, MAX_CUSUM_BLOCK)
+            start += stop
+
+        self.cusum_pos[i, j], self.cusum_neg[i, j] = pos, neg
+        return upper, lower, np.maximum(upper, lower) > self.cusum_limit
+
+    def update_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Ingests the `{prize}_transition_surprise` columns of a feature table
+        (newest draw first, as built by `build_feature_table`) and returns the
+        detector columns aligned with `df`
+        """
+        surprise_cols = [f"{col}_transition_surprise" for col in self.prize_cols]
+        out = self.update(df[surprise_cols].to_numpy(dtype=float)[::-1])
+
+        columns = {}
+        for i, col in enumerate(self.prize_cols):
+            for j, w in enumerate(self.windows):
+                columns[f"{col}_surprise_zscore_{w}"] = out["zscore"][::-1, i, j]
+                columns[f"{col}_surprise_ewma_zscore_{w}"] = out["ewma_zscore"][::-1, i, j]
+                columns[f"{col}_surprise_cusum_{w}"] = out["cusum"][::-1, i, j]
+                columns[f"{col}_is_anomaly_{w}"] = out["is_anomaly"][::-1, i, j].astype(int)
+        return pd.DataFrame(columns, index=df.index)
+
+    # ---------------- persistence ----------------
+
+    def save(self, path) -> None:
+        """
+        Writes the detector state to one .npz file
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        config = {
+            "windows": self.windows.tolist(),
+            "prize_cols": self.prize_cols,
+            "threshold": self.threshold,
+            "cusum_slack": self.cusum_slack,
+            "cusum_limit": self.cusum_limit,
+        }
+        arrays = {name: getattr(self, name) for name in STATE_ARRAYS}
+        with open(path, "wb") as f:
+            np.savez(f, config=np.array(json.dumps(config)), **arrays)
+
+    @classmethod
+    def load(cls, path) -> "AnomalyEngine":
+        with np.load(path) as data:
+            engine = cls(**json.loads(str(data["config"])))
+            for name in STATE_ARRAYS:
+                setattr(engine, name, data[name].copy())
+        return engine
+
+
+def add_streaming_anomaly_features(df: pd.DataFrame, windows=WINDOWS, **params) -> pd.DataFrame:
+    """
+    Adds per-prize rolling z-score, EWMA z-score, CUSUM and anomaly flag
+    columns for every window, computed by streaming the draws oldest first
+    """
+    engine = AnomalyEngine(windows=windows, **params)
+    return pd.concat([df, engine.update_frame(df)], axis=1)
@@ -1,26 +1,43 @@
 
-def add_anomaly_features(df, window=10):
+import numpy as np
+import pandas as pd
+
+from src.features.feature_block import with_columns
+
+
+def anomaly_feature_columns(transition_surprise, window=10) -> dict:
     """
-    Detects local anomalies using transition surprise residuals.
+    New columns of `add_anomaly_features` as arrays, computed from the
+    generic transition surprise
     """
-    df = df.copy()
+    surprise = pd.Series(transition_surprise, copy=False)
 
     # Rolling expectation of surprise
-    df["expected_surprise"] = df["transition_surprise"].rolling(window).mean()
+    expected = surprise.rolling(window).mean()
 
     # Residual = actual - expected
-    df["surprise_residual"] = df["transition_surprise"] - df["expected_surprise"]
+    residual = surprise - expected
 
     # Rolling std for normalization
-    rolling_std = df["transition_surprise"].rolling(window).std()
+    rolling_std = surprise.rolling(window).std()
 
     # Z-score (how extreme is this draw locally?)
-    df["surprise_zscore"] = df["surprise_residual"] / rolling_std
+    zscore = residual / rolling_std
 
-    # Anomaly flag (tunable threshold)
-    df["is_anomaly"] = (df["surprise_zscore"].abs() > 2.0).astype(int)
+    return {
+        "expected_surprise": expected.to_numpy(),
+        "surprise_residual": residual.to_numpy(),
+        "surprise_zscore": zscore.to_numpy(),
+        # Anomaly flag (tunable threshold)
+        "is_anomaly": (np.abs(zscore.to_numpy()) > 2.0).astype(int),
+    }
 
-    return df
+
+def add_anomaly_features(df, window=10):
+    """
+    Detects local anomalies using transition surprise residuals.
+    """
+    return with_columns(df, anomaly_feature_columns(df["transition_surprise"].to_numpy(), window))
 
 
 if __name__ == "__main__":
@@ -6,62 +6,133 @@ import numpy as np
 os.makedirs("outputs", exist_ok=True)
 
 # --- Import data and feature modules ---
-from src.data.load import load_raw_data
+from src.utils.profiling import profile_stage, profiled
+from src.data.load import DATA_PATH, PRIZE_COLS, load_raw_data
 from src.data.clean import clean_data
-from src.features.rolling_features import add_rolling_features
-from src.features.transition_features import add_transition_features
-from src.features.anomaly_features import add_anomaly_features
+from src.features.feature_block import FeatureBlock
+from src.features.rolling_features import rolling_feature_columns
+from src.features.transition_features import transition_feature_columns
+from src.features.anomaly_features import anomaly_feature_columns
+from src.features.schema import compact_feature_table
 from src.features.transition_features import build_last_digit_transition_matrix, transition_probability_matrix
 
 
 
-def build_feature_table(window: int = 10) -> pd.DataFrame:
+def compute_feature_table(df: pd.DataFrame, window: int = 10, prefix_transitions: bool = False) -> pd.DataFrame:
     """
-    Builds the full feature table:
-    1. Loads and cleans raw data
-    2. Adds rolling features
-    3. Adds transition-based features
-    4. Adds anomaly features
+    Adds rolling, transition and anomaly features to a cleaned draw table
+    and fills missing values. Does not touch the filesystem.
+    `prefix_transitions` is passed to `transition_feature_columns` as `prefix`.
+
+    Every stage returns only its new columns into one `FeatureBlock` and
+    the table is assembled once at the end; the `add_*_features` functions
+    give the same columns stage by stage.
     """
-    # 1. Load raw data
-    df = load_raw_data()
+    block = FeatureBlock(df)
+    prizes = block.values(PRIZE_COLS)
+
+    # 1. Rolling features
+    with profile_stage("rolling"):
+        block.add(rolling_feature_columns(prizes, window=window))
+
+    # 2. Transition features
+    with profile_stage("transition"):
+        block.add(transition_feature_columns(prizes, prefix=prefix_transitions))
+
+    # 3. Anomaly features
+    with profile_stage("anomaly"):
+        block.add(anomaly_feature_columns(block["transition_surprise"], window=window))
+
+    # 4. Handle missing values safely, then assemble the table once
+    with profile_stage("finalize") as stage:
+        block.add(finalize_feature_columns(block.columns, window=window))
+        df = block.frame()
+        stage.output(df)
+    return df
 
-    # 2. Clean the data
-    df = clean_data(df)
 
-    # 3. Add rolling features
-    df = add_rolling_features(df, window=window)
+def finalize_feature_columns(columns, window: int = 10) -> dict:
+    """
+    Missing-value handling of the feature builders over a mapping of column
+    name -> values (a DataFrame or a dict of arrays). Returns the filled
+    columns and the recomputed anomaly flag as arrays.
+    """
+    def column(name):
+        return pd.Series(columns[name], copy=False)
 
-    # 4. Add transition features
-    df = add_transition_features(df)
+    filled = {
+        'prev_last_digit': column('prev_last_digit').fillna(0),
+        'transition_prob': column('transition_prob').fillna(0),
+        'expected_surprise': column('expected_surprise').fillna(
+            column('transition_surprise').rolling(window, min_periods=1).mean()
+        ),
+    }
 
-    # 5. Add anomaly features
-    df = add_anomaly_features(df, window=window)
+    for name in [name for name in columns if 'rolling' in name]:
+        values = column(name)
+        filled[name] = values.fillna(values.mean())
 
-    # 6. Handle missing values safely
-    df['prev_last_digit'] = df['prev_last_digit'].fillna(0)
-    df['transition_prob'] = df['transition_prob'].fillna(0)
-    df['expected_surprise'] = df['expected_surprise'].fillna(
-        df['transition_surprise'].rolling(window, min_periods=1).mean()
-    )
+    filled['surprise_residual'] = column('surprise_residual').fillna(0)
+    filled['surprise_zscore'] = column('surprise_zscore').fillna(0)
+    filled['is_anomaly'] = (filled['surprise_zscore'].abs() > 2.0).astype(int)
+
+    return {name: values.to_numpy() for name, values in filled.items()}
 
-    rolling_cols = [col for col in df.columns if 'rolling' in col]
-    for col in rolling_cols:
-        df[col] = df[col].fillna(df[col].mean())
 
-    df['surprise_residual'] = df['surprise_residual'].fillna(0)
-    df['surprise_zscore'] = df['surprise_zscore'].fillna(0)
-    df['is_anomaly'] = (df['surprise_zscore'].abs() > 2.0).astype(int)
+def finalize_feature_table(df: pd.DataFrame, window: int = 10) -> pd.DataFrame:
+    """
+    Fills missing values left by the feature builders and recomputes the
+    anomaly flag. Modifies `df` in place and returns it.
+    """
+    for name, values in finalize_feature_columns(df, window=window).items():
+        df[name] = values
+    return df
+
 
-    # 7. Save feature table
+def save_feature_table(df: pd.DataFrame) -> None:
+    """
+    Writes the feature table and its top anomalies to the outputs folder.
+    """
     df.to_csv("outputs/prizebond_features.csv", index=False)
 
-    # 8. Save anomalies
     top_anomalies = df[df['is_anomaly'] == 1].sort_values(
         by='surprise_zscore', key=abs, ascending=False
     )
     top_anomalies.to_csv("outputs/top_anomalies.csv", index=False)
 
+
+@profiled("build_feature_table")
+def build_feature_table(window: int = 10, data_path=DATA_PATH, compact: bool = False) -> pd.DataFrame:
+    """
+    Builds the full feature table:
+    1. Loads and cleans raw data
+    2. Adds rolling features
+    3. Adds transition-based features
+    4. Adds anomaly features
+    With `compact`, the table uses the compact dtypes and compatibility
+    aliases of `compact_feature_table`.
+    """
+    # 1. Load raw data
+    with profile_stage("load") as stage:
+        df = load_raw_data(data_path)
+        stage.output(df)
+
+    # 2. Clean the data
+    with profile_stage("clean") as stage:
+        df = clean_data(df)
+        stage.output(df)
+
+    # 3. Add rolling, transition and anomaly features
+    df = compute_feature_table(df, window=window)
+    if compact:
+        with profile_stage("compact") as stage:
+            df = compact_feature_table(df, window=window)
+            stage.output(df)
+
+    # 4. Save feature table and anomalies
+    with profile_stage("save"):
+        save_feature_table(df)
+
     return df
 
 
@@ -80,16 +151,8 @@ def predict_next_numbers(df: pd.DataFrame, top_n: int = 5) -> pd.DataFrame:
     last_digit = recent_first.iloc[-1] % 10
 
     # --- Transition probability for last digits ---
-    count_matrix = np.zeros((10, 10), dtype=int)
-    digits = df_features['first_prize'] % 10
-    for i in range(1, len(digits)):
-        prev_d = digits.iloc[i - 1]
-        curr_d = digits.iloc[i]
-        count_matrix[prev_d, curr_d] += 1
-
-    prob_matrix = count_matrix.astype(float)
-    row_sums = prob_matrix.sum(axis=1, keepdims=True)
-    prob_matrix = np.divide(prob_matrix, row_sums, where=row_sums != 0)
+    count_matrix = build_last_digit_transition_matrix(df_features['first_prize'])
+    prob_matrix = transition_probability_matrix(count_matrix)
 
     next_digit_probs = prob_matrix[last_digit]
 
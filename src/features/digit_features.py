@@ -1,37 +1,61 @@
+import numpy as np
 import pandas as pd
 
+from src.data.load import PRIZE_COLS
+from src.features.feature_block import with_columns
+
 DIGIT_COUNT = 6  # 6-digit prize bond numbers
 
+# Place value of each digit position, most significant first
+_PLACE_VALUES = 10 ** np.arange(DIGIT_COUNT - 1, -1, -1, dtype=np.int64)
+
+
+def digit_tensor(values) -> np.ndarray:
+    """
+    Splits integer numbers into their six digits with integer arithmetic.
+    A (draws, prizes) array gives a (draws, prizes, 6) uint8 tensor.
+    Example: 871778 → [8, 7, 1, 7, 7, 8]
+    Raises ValueError for numbers outside 0..999999.
+    """
+    values = np.asarray(values, dtype=np.int64)
+    if values.size and (values.min() < 0 or values.max() >= 10 ** DIGIT_COUNT):
+        raise ValueError(f"Prize bond numbers must lie in [0, {10 ** DIGIT_COUNT})")
+    return ((values[..., None] // _PLACE_VALUES) % 10).astype(np.uint8)
+
+
+def digit_frame(tensor: np.ndarray, prize_cols=PRIZE_COLS, index=None) -> pd.DataFrame:
+    """
+    DataFrame view of a (draws, prizes, 6) digit tensor with columns
+    {prize}_d1 ... {prize}_d6, backed by the tensor's memory without a copy.
+    """
+    n_rows = tensor.shape[0]
+    columns = [f"{prefix}_d{i+1}" for prefix in prize_cols for i in range(DIGIT_COUNT)]
+    return pd.DataFrame(tensor.reshape(n_rows, -1), columns=columns, index=index, copy=False)
+
+
 def split_number_into_digits(series: pd.Series, prefix: str) -> pd.DataFrame:
     """
     Splits a numeric series into individual digit columns.
     Example: 871778 → prefix_d1=8, prefix_d2=7, ..., prefix_d6=8
     """
-    df_digits = pd.DataFrame()
+    tensor = digit_tensor(series.to_numpy()[:, None])
+    return digit_frame(tensor, [prefix], index=series.index)
 
-    str_numbers = series.astype(int).astype(str).str.zfill(DIGIT_COUNT)
 
-    for i in range(DIGIT_COUNT):
-        df_digits[f"{prefix}_d{i+1}"] = str_numbers.str[i].astype(int)
-
-    return df_digits
+def digit_feature_columns(values: np.ndarray, prize_cols=PRIZE_COLS) -> dict:
+    """
+    New columns of `add_digit_features` as views of one (draws, prizes, 6)
+    digit tensor, computed from the (draws, prizes) array of prize numbers
+    """
+    tensor = digit_tensor(values)
+    return {
+        f"{prefix}_d{i+1}": tensor[:, p, i]
+        for p, prefix in enumerate(prize_cols) for i in range(DIGIT_COUNT)
+    }
 
 
 def add_digit_features(df: pd.DataFrame) -> pd.DataFrame:
     """
     Adds digit-level columns for all prize numbers.
     """
-    df = df.copy()
-
-    prize_cols = [
-        "first_prize",
-        "second_prize_1",
-        "second_prize_2",
-        "second_prize_3",
-    ]
-
-    for col in prize_cols:
-        digits_df = split_number_into_digits(df[col], col)
-        df = pd.concat([df, digits_df], axis=1)
-
-    return df
+    return with_columns(df, digit_feature_columns(df[PRIZE_COLS].to_numpy()))
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+
+def with_columns(df: pd.DataFrame, columns: dict) -> pd.DataFrame:
+    """
+    `df` plus `columns` (name -> array) as a new frame assembled in one
+    step. Neither the columns of `df` nor the new arrays are copied; a
+    column that already exists is replaced at its position.
+    """
+    data = {col: df[col] for col in df.columns}
+    data.update(columns)
+    return pd.DataFrame(data, index=df.index, copy=False)
+
+
+class FeatureBlock:
+    """
+    Feature columns of one build, assembled with the cleaned table once.
+
+    Builder stages read their inputs with `block[name]` and return only
+    their new columns as arrays, which `add` keeps as they are. `frame()`
+    then builds the finished table in a single step, so no stage copies
+    the growing table and peak memory stays close to the final table.
+    """
+
+    def __init__(self, base: pd.DataFrame):
+        self.base = base
+        self.columns = {}
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        if name in self.columns:
+            return self.columns[name]
+        return self.base[name].to_numpy()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns or name in self.base.columns
+
+    def add(self, columns: dict) -> "FeatureBlock":
+        self.columns.update(columns)
+        return self
+
+    def values(self, names) -> np.ndarray:
+        """
+        (rows, len(names)) array of the named columns
+        """
+        return np.column_stack([self[name] for name in names])
+
+    def frame(self) -> pd.DataFrame:
+        return with_columns(self.base, self.columns)
@@ -0,0 +1,205 @@
+import pickle
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.data.clean import clean_data
+from src.data.load import PRIZE_COLS
+from src.features.rolling_features import rolling_feature_columns
+from src.features.transition_features import build_transition_tensor, transition_probability_matrix
+from src.features.anomaly_features import anomaly_feature_columns
+from src.features.anomaly_engine import AnomalyEngine
+from src.features.combined_features import compute_feature_table, finalize_feature_columns
+
+MIN_CAPACITY = 1024
+
+
+class FeatureState:
+    """
+    Persistent feature table that can ingest newly published draws.
+
+    Columns live in growable buffers in chronological order (oldest draw
+    first), so new draws are appended without copying the history;
+    `table` is a newest-first view of them, as produced by
+    `build_feature_table`, and is valid until the next `ingest`.
+    `ingest` recomputes
+    - rolling features for the new draws and the `window - 1` draws before
+      them (a window only looks at newer draws)
+    - the transition counts from the new pairs only
+    - transition probabilities/surprises and the anomaly statistics over the
+      history with vectorised lookups: the probabilities are estimated from
+      the counts of all draws, so a new draw changes them everywhere
+    - the streaming `AnomalyEngine`, fed only the newly scored draws; its
+      detector output for them is kept in `alerts`
+    """
+
+    def __init__(self, table: pd.DataFrame, counts: np.ndarray, window: int = 10,
+                 engine: AnomalyEngine = None):
+        self.counts = counts
+        self.window = window
+        self.engine = engine
+        self.alerts = None
+
+        self.columns = list(table.columns)
+        self.dtypes = table.dtypes.to_dict()
+        self.size = len(table)
+        capacity = max(MIN_CAPACITY, 2 * self.size)
+        self.buffers = {}
+        for col in self.columns:
+            values = table[col].to_numpy()[::-1]
+            self.buffers[col] = np.empty(capacity, dtype=values.dtype)
+            self.buffers[col][:self.size] = values
+        self._table = None
+
+    @classmethod
+    def from_clean_data(cls, df: pd.DataFrame, window: int = 10) -> "FeatureState":
+        """
+        Builds the state from a cleaned draw table
+        """
+        table = compute_feature_table(df, window=window)
+        counts = build_transition_tensor(table[PRIZE_COLS].to_numpy())
+        engine = AnomalyEngine(windows=(window,))
+        engine.update_frame(table)
+        return cls(table, counts, window, engine)
+
+    # ---------------- buffers ----------------
+
+    def _reserve(self, size: int) -> None:
+        capacity = len(next(iter(self.buffers.values())))
+        if size <= capacity:
+            return
+        capacity = max(size, 2 * capacity)
+        for col, values in self.buffers.items():
+            grown = np.empty(capacity, dtype=values.dtype)
+            grown[:self.size] = values[:self.size]
+            self.buffers[col] = grown
+
+    def _newest_first(self, col: str, start: int = 0) -> np.ndarray:
+        """
+        Newest-first view of chronological rows `start` .. size - 1
+        """
+        return self.buffers[col][start:self.size][::-1]
+
+    def _write(self, columns: dict, start: int = 0) -> None:
+        """
+        Stores newest-first arrays covering chronological rows `start` .. size - 1
+        """
+        for col, values in columns.items():
+            self.buffers[col][start:self.size] = np.asarray(values)[::-1]
+
+    @property
+    def table(self) -> pd.DataFrame:
+        if self._table is None:
+            data = {}
+            for col in self.columns:
+                values = self._newest_first(col)
+                dtype = self.dtypes[col]
+                data[col] = values if isinstance(dtype, np.dtype) else pd.array(values, dtype=dtype)
+            self._table = pd.DataFrame(data, copy=False)
+        return self._table
+
+    # ---------------- ingestion ----------------
+
+    def ingest(self, new_draws: pd.DataFrame) -> pd.DataFrame:
+        """
+        Adds one or more raw draws (same schema as the raw CSV) that are more
+        recent than every draw already in the table. Returns the updated table.
+        """
+        new = clean_data(new_draws)
+        if len(new) == 0:
+            return self.table
+        if self.size and (new["draw_date"] <= self.buffers["draw_date"][self.size - 1]).any():
+            raise ValueError("New draws must be more recent than the latest ingested draw")
+
+        k, w = len(new), self.window
+        old_size = self.size
+        self._reserve(old_size + k)
+        self.size = old_size + k
+        self._table = None
+        for col in new.columns:
+            self.buffers[col][old_size:self.size] = new[col].to_numpy()[::-1]
+
+        # 1. Rolling windows only look at newer draws, so just the newest k + w - 1 change
+        start = max(0, self.size - (k + w - 1))
+        prizes = np.column_stack([self._newest_first(col, start) for col in PRIZE_COLS])
+        self._write(rolling_feature_columns(prizes, window=w), start)
+
+        # 2. Transitions: count the new pairs, then look up every row again
+        self._update_transitions(k)
+
+        # 3. Anomaly statistics over the refreshed generic surprise
+        columns = {name: self._newest_first(name) for name in
+                   ['prev_last_digit', 'transition_prob', 'transition_surprise']}
+        columns.update(anomaly_feature_columns(columns['transition_surprise'], window=w))
+        self._write(finalize_feature_columns(columns, window=w))
+
+        # 4. Streaming detectors: the new draws and the old head, which now has a previous draw
+        if self.engine is not None:
+            head = max(0, self.size - k - 1)
+            scored = pd.DataFrame({
+                col: self._newest_first(col, head)
+                for col in ["draw_no", "draw_date"] + [f"{p}_transition_surprise" for p in PRIZE_COLS]
+            })
+            self.alerts = pd.concat(
+                [scored[["draw_no", "draw_date"]], self.engine.update_frame(scored)], axis=1
+            )
+
+        return self.table
+
+    def _update_transitions(self, k: int) -> None:
+        """
+        Adds the transitions introduced by `k` new draws to the counts and
+        rewrites the transition columns. Row t's previous draw is the next
+        newer one, so in chronological order prev[j] = digit[j + 1].
+        """
+        n = self.size
+        head = max(0, n - k - 1)
+
+        # New pairs: the k new draws and the draw that was newest before them
+        values = np.column_stack([self.buffers[col][head:n] for col in PRIZE_COLS])
+        self.counts = self.counts + build_transition_tensor(values[::-1])
+        prob_tensor = transition_probability_matrix(self.counts)
+
+        for i, col in enumerate(PRIZE_COLS):
+            digits = self.buffers[f'{col}_last_digit']
+            digits[head:n] = values[:, i].astype(np.int64) % 10
+            digits = digits[:n]
+
+            prev = self.buffers[f'{col}_prev_last_digit']
+            prev[head:n - 1] = digits[head + 1:]
+            prev[n - 1] = np.nan
+
+            probs = np.full(n, np.nan)
+            probs[:-1] = prob_tensor[i, digits[1:], digits[:-1]]
+            self.buffers[f'{col}_transition_prob'][:n] = probs
+            self.buffers[f'{col}_transition_surprise'][:n] = -np.log(np.where(probs > 0, probs, np.nan))
+
+        # --- Generic columns for backward compatibility (filled with the anomaly stage) ---
+        self.buffers['last_digit'][head:n] = self.buffers['first_prize_last_digit'][head:n]
+        self.buffers['prev_last_digit'][head:n] = self.buffers['first_prize_prev_last_digit'][head:n]
+        for name in ['transition_prob', 'transition_surprise']:
+            values = self.buffers[f'first_prize_{name}'][:n]
+            self.buffers[name][:n] = np.where(np.isnan(values), 0.0, values)
+
+    # ---------------- persistence ----------------
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["_table"] = None
+        state["buffers"] = {col: values[:self.size].copy() for col, values in self.buffers.items()}
+        return state
+
+    def save(self, path) -> None:
+        """
+        Persists the state so the next draw can be ingested without a rebuild
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            pickle.dump(self, f)
+
+    @staticmethod
+    def load(path) -> "FeatureState":
+        with open(path, "rb") as f:
+            return pickle.load(f)
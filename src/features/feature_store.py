@@ -0,0 +1,190 @@
+import ast
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.data.load import DATA_PATH, PROJECT_ROOT
+
+STORE_DIR = Path("outputs") / "feature_store"
+
+# Module that builds the feature table; its source and that of every `src`
+# module it imports define the store key, so editing any of them forces a rebuild.
+FEATURE_MODULE = "src.features.combined_features"
+
+SCHEMA_FILE = "schema.json"
+
+
+def _imported_src_modules(path: Path) -> set:
+    """
+    Names of the `src` modules imported anywhere in a source file
+    """
+    names = set()
+    for node in ast.walk(ast.parse(path.read_text())):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+            names.add(node.module)
+            names.update(f"{node.module}.{alias.name}" for alias in node.names)
+    return {name for name in names if name.split(".")[0] == "src"}
+
+
+def module_sources(*modules) -> list:
+    """
+    Project-relative source paths of `modules` (dotted names, or functions
+    whose module is meant) and of every `src` module they import, directly
+    or through other `src` modules
+    """
+    pending = [m if isinstance(m, str) else m.__module__ for m in modules]
+    seen, sources = set(), set()
+    while pending:
+        name = pending.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        # `from src.x import y` may name a module or an attribute of src.x
+        rel_path = name.replace(".", "/") + ".py"
+        if (PROJECT_ROOT / rel_path).exists():
+            sources.add(rel_path)
+            pending.extend(_imported_src_modules(PROJECT_ROOT / rel_path))
+    return sorted(sources)
+
+
+def code_version() -> str:
+    """
+    Hash of the feature pipeline source code
+    """
+    h = hashlib.sha256()
+    for rel_path in module_sources(FEATURE_MODULE):
+        h.update(rel_path.encode())
+        h.update((PROJECT_ROOT / rel_path).read_bytes())
+    return h.hexdigest()
+
+
+def feature_key(window: int = 10, data_path: Path = DATA_PATH, compact: bool = False) -> str:
+    """
+    Content address of a feature table: raw data bytes + window + code version
+    """
+    h = hashlib.sha256()
+    h.update(Path(data_path).read_bytes())
+    h.update(f"window={window}".encode())
+    if compact:
+        h.update(b"compact")
+    h.update(code_version().encode())
+    return h.hexdigest()[:32]
+
+
+def save_features(df: pd.DataFrame, key: str, store_dir: Path = STORE_DIR) -> Path:
+    """
+    Writes a feature table as one .npy file per column plus a JSON schema.
+    Strings are stored as categorical codes, datetimes as int64 ticks.
+    A column backed by the same array as an earlier one (an alias of a
+    compact table) is stored once and recorded as an alias.
+    """
+    target = Path(store_dir) / key
+    tmp = Path(store_dir) / f".{key}.{os.getpid()}.tmp"
+    if tmp.exists():
+        shutil.rmtree(tmp)
+    tmp.mkdir(parents=True)
+
+    schema = {"key": key, "n_rows": len(df), "columns": []}
+    buffers = {}
+    for i, col in enumerate(df.columns):
+        series = df[col]
+        entry = {"name": col, "file": f"{i:04d}.npy"}
+
+        if isinstance(series.dtype, np.dtype):
+            values = series.to_numpy()
+            buffer = (values.__array_interface__["data"][0], values.dtype.str, values.shape)
+            if buffer in buffers:
+                schema["columns"].append({"name": col, "kind": "alias", "of": buffers[buffer]})
+                continue
+            buffers[buffer] = col
+
+        if pd.api.types.is_datetime64_any_dtype(series):
+            values = series.to_numpy()
+            entry["kind"] = "datetime"
+            entry["dtype"] = str(values.dtype)
+            values = values.view(np.int64)
+        elif isinstance(series.dtype, pd.CategoricalDtype):
+            values = series.cat.codes.to_numpy()
+            entry["kind"] = "categorical"
+            entry["categories"] = [str(c) for c in series.cat.categories]
+        elif pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+            values = series.to_numpy()
+            entry["kind"] = "numeric"
+            entry["dtype"] = str(values.dtype)
+        else:
+            categorical = pd.Categorical(series)
+            values = categorical.codes.astype(np.int32)
+            entry["kind"] = "category"
+            entry["categories"] = [str(c) for c in categorical.categories]
+
+        np.save(tmp / entry["file"], np.ascontiguousarray(values))
+        schema["columns"].append(entry)
+
+    with open(tmp / SCHEMA_FILE, "w") as f:
+        json.dump(schema, f, indent=2)
+
+    if target.exists():
+        shutil.rmtree(tmp)
+    else:
+        tmp.rename(target)
+    return target
+
+
+def load_features(key: str, store_dir: Path = STORE_DIR, mmap: bool = True):
+    """
+    Loads a stored feature table, memory-mapping numeric columns.
+    Aliases are backed by the same array as their source column.
+    Returns None when the key is not in the store.
+    """
+    target = Path(store_dir) / key
+    schema_path = target / SCHEMA_FILE
+    if not schema_path.exists():
+        return None
+
+    with open(schema_path) as f:
+        schema = json.load(f)
+
+    data = {}
+    for entry in schema["columns"]:
+        if entry["kind"] == "alias":
+            data[entry["name"]] = data[entry["of"]]
+            continue
+        values = np.load(target / entry["file"], mmap_mode="r" if mmap else None)
+        if entry["kind"] == "datetime":
+            data[entry["name"]] = np.asarray(values).view(entry["dtype"])
+        elif entry["kind"] == "category":
+            codes = np.asarray(values)
+            categories = np.array(entry["categories"], dtype=object)
+            column = np.where(codes >= 0, categories[np.maximum(codes, 0)], None)
+            data[entry["name"]] = column
+        elif entry["kind"] == "categorical":
+            data[entry["name"]] = pd.Categorical.from_codes(np.asarray(values), entry["categories"])
+        else:
+            data[entry["name"]] = values
+
+    return pd.DataFrame(data, copy=False)
+
+
+def get_feature_table(window: int = 10, store_dir: Path = STORE_DIR, compact: bool = False) -> pd.DataFrame:
+    """
+    Returns the feature table for `window`, building and storing it only when
+    the raw data, window or feature code changed since the last build.
+    `compact` selects the compact dtype layout of `src.features.schema`.
+    """
+    key = feature_key(window, compact=compact)
+    df = load_features(key, store_dir)
+    if df is not None:
+        return df
+
+    from src.features.combined_features import build_feature_table
+
+    df = build_feature_table(window=window, compact=compact)
+    save_features(df, key, store_dir)
+    return df
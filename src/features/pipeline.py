@@ -0,0 +1,156 @@
+import hashlib
+import json
+from pathlib import Path
+
+import pandas as pd
+
+from src.utils.profiling import profile_stage
+from src.data.load import DATA_PATH, PROJECT_ROOT, load_raw_data
+from src.data.clean import clean_data
+from src.features.rolling_features import add_rolling_features
+from src.features.transition_features import add_positional_transition_features, add_transition_features
+from src.features.anomaly_features import add_anomaly_features
+from src.features.combined_features import finalize_feature_table
+from src.features.digit_features import add_digit_features
+from src.features.feature_store import STORE_DIR, load_features, module_sources, save_features
+from src.features.schema import compact_feature_table
+
+STAGE_DIR = STORE_DIR / "stages"
+
+
+def add_finalized_anomaly_features(df: pd.DataFrame, window: int = 10) -> pd.DataFrame:
+    """
+    Anomaly features followed by the missing-value handling of build_feature_table
+    """
+    df = add_anomaly_features(df, window=window)
+    return finalize_feature_table(df, window=window)
+
+
+def add_digit_stage_features(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Digit features followed by the per-position transition features
+    """
+    return add_positional_transition_features(add_digit_features(df))
+
+
+class Stage:
+    """
+    One node of the feature pipeline.
+    - func: called as func(*input_frames, **params)
+    - inputs: names of upstream stages
+    - code_files: sources whose contents are part of the fingerprint; by
+      default the module of `func` and every `src` module it imports
+    - persist: cache the output on disk as well as in memory
+    """
+
+    def __init__(self, name, func, inputs=(), params=None, code_files=None, persist=True):
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.params = dict(params or {})
+        self.code_files = tuple(module_sources(func) if code_files is None else code_files)
+        self.persist = persist
+
+
+class FeaturePipeline:
+    """
+    Memoized load → clean → rolling → transition → anomaly → digits DAG,
+    plus a `compact` stage: the anomaly-stage table in compact dtypes.
+
+    Each stage is keyed by a fingerprint of its code, parameters and the
+    fingerprints of its inputs, so changing e.g. the window only reruns the
+    stages downstream of it. Outputs are cached in memory for the process and
+    in the feature store on disk across runs.
+    """
+
+    def __init__(self, window: int = 10, data_path: Path = DATA_PATH,
+                 cache_dir: Path = STAGE_DIR, use_disk: bool = True):
+        self.window = window
+        self.data_path = Path(data_path)
+        self.cache_dir = Path(cache_dir)
+        self.use_disk = use_disk
+        self.stages = {}
+        self._memory = {}
+        self._fingerprints = {}
+
+        # The loader is a bound method of this class: fingerprint load.py only
+        self.add_stage(Stage("load", self._load, persist=False, code_files=module_sources(load_raw_data)))
+        self.add_stage(Stage("clean", clean_data, ["load"]))
+        self.add_stage(Stage("rolling", add_rolling_features, ["clean"], {"window": window}))
+        self.add_stage(Stage("transition", add_transition_features, ["rolling"]))
+        self.add_stage(Stage("anomaly", add_finalized_anomaly_features, ["transition"], {"window": window}))
+        self.add_stage(Stage("digits", add_digit_stage_features, ["anomaly"]))
+        self.add_stage(Stage("compact", compact_feature_table, ["anomaly"], {"window": window}))
+
+    def _load(self) -> pd.DataFrame:
+        return load_raw_data(self.data_path)
+
+    def add_stage(self, stage: Stage) -> None:
+        """
+        Registers (or replaces) a stage. Inputs must already be registered.
+        """
+        missing = [name for name in stage.inputs if name not in self.stages]
+        if missing:
+            raise KeyError(f"Unknown input stages for {stage.name}: {missing}")
+        self.stages[stage.name] = stage
+        self._fingerprints.clear()
+
+    def fingerprint(self, name: str) -> str:
+        if name in self._fingerprints:
+            return self._fingerprints[name]
+
+        stage = self.stages[name]
+        h = hashlib.sha256()
+        h.update(name.encode())
+        h.update(json.dumps(stage.params, sort_keys=True, default=str).encode())
+        for rel_path in stage.code_files:
+            h.update((PROJECT_ROOT / rel_path).read_bytes())
+        if name == "load":
+            h.update(self.data_path.read_bytes())
+        for input_name in stage.inputs:
+            h.update(self.fingerprint(input_name).encode())
+
+        self._fingerprints[name] = h.hexdigest()[:32]
+        return self._fingerprints[name]
+
+    def run(self, name: str) -> pd.DataFrame:
+        """
+        Returns the output of stage `name`, computing only stages whose
+        fingerprint is not cached. The result is a shallow copy of the
+        cached frame: add columns freely, but do not edit values in place.
+        """
+        fp = self.fingerprint(name)
+        if fp in self._memory:
+            return self._memory[fp].copy(deep=False)
+
+        stage = self.stages[name]
+        key = f"{name}-{fp}"
+        df = None
+        if self.use_disk and stage.persist:
+            df = load_features(key, self.cache_dir)
+
+        if df is None:
+            inputs = [self.run(input_name) for input_name in stage.inputs]
+            with profile_stage(f"pipeline.{name}") as record:
+                df = stage.func(*inputs, **stage.params)
+                record.output(df)
+            if self.use_disk and stage.persist:
+                save_features(df, key, self.cache_dir)
+
+        self._memory[fp] = df
+        return df.copy(deep=False)
+
+    def clear_memory(self) -> None:
+        self._memory.clear()
+
+
+_PIPELINES = {}
+
+
+def get_pipeline(window: int = 10) -> FeaturePipeline:
+    """
+    Process-wide pipeline for `window`, shared by every script in a batch run
+    """
+    if window not in _PIPELINES:
+        _PIPELINES[window] = FeaturePipeline(window=window)
+    return _PIPELINES[window]
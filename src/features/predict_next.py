@@ -5,13 +5,18 @@ from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.metrics import mean_absolute_error
 
+from src.utils.profiling import profile_stage, profiled
+from src.features.feature_store import get_feature_table
 
-def load_features(file_path="outputs/prizebond_features.csv"):
+
+def load_features(file_path=None, window: int = 10):
     """
-    Load combined features CSV with updated rolling and transition features
+    Load combined features with updated rolling and transition features.
+    Reads from the feature store unless a CSV `file_path` is given.
     """
-    df = pd.read_csv(file_path)
-    return df
+    if file_path is not None:
+        return pd.read_csv(file_path)
+    return get_feature_table(window=window)
 
 
 def prepare_target(df: pd.DataFrame) -> pd.DataFrame:
@@ -65,14 +70,15 @@ def build_features_for_prize(df: pd.DataFrame, prize_col: str, window: int = 10)
     return feature_list
 
 
-def main():
-    # Step 1: Load features
-    df = load_features()
-
-    # Step 2: Prepare next draw targets
+def predict_next_draw(df: pd.DataFrame, window: int = 10) -> dict:
+    """
+    Trains one model per prize on a feature table and predicts the next
+    draw's numbers from its last row
+    """
+    # Prepare next draw targets
     df = prepare_target(df)
 
-    # Step 3: Train and predict for each prize
+    # Train and predict for each prize
     prize_columns = [
         ('first_prize', 'next_first_prize'),
         ('second_prize_1', 'next_second_prize_1'),
@@ -83,18 +89,34 @@ def main():
     predictions = {}
 
     for prize_col, target_col in prize_columns:
-        features = build_features_for_prize(df, prize_col)
+        features = build_features_for_prize(df, prize_col, window=window)
         X = df[features]
         y = df[target_col]
 
         print(f"\nTraining model for {prize_col}...")
-        model = train_model(X, y)
+        with profile_stage(f"train_{prize_col}") as stage:
+            stage.output(X)
+            model = train_model(X, y)
 
         # Predict next number using last row of features
         X_last = X.iloc[[-1]]
         pred = round(model.predict(X_last)[0])
         predictions[prize_col] = pred
 
+    return predictions
+
+
+@profiled("predict_next")
+def main(df: pd.DataFrame = None, window: int = 10):
+    # Step 1: Load features (unless a feature table is passed in)
+    if df is None:
+        with profile_stage("load") as stage:
+            df = load_features(window=window)
+            stage.output(df)
+
+    # Step 2-3: Train and predict for each prize
+    predictions = predict_next_draw(df, window=window)
+
     # Step 4: Print predictions
     print("\n=== Predicted Next Draw Numbers ===")
     for prize, value in predictions.items():
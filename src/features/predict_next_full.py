@@ -1,36 +1,23 @@
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestRegressor
 from sklearn.model_selection import train_test_split
 
 from src.data.clean import clean_data
-from src.features.combined_features import build_feature_table
-from src.features.digit_features import add_digit_features
+from src.utils.profiling import profile_stage, profiled
+from src.features.pipeline import get_pipeline
+from src.models.registry import get_registry
 
 DIGIT_COUNT = 6
 
 
-def train_digit_model(X, y):
-    model = RandomForestRegressor(
-        n_estimators=300,
-        max_depth=12,
-        random_state=42,
-        n_jobs=-1
-    )
-    model.fit(X, y)
-    return model
-
-
-def main():
-    # 1. Build full feature table
-    df = build_feature_table(window=10)
-
-    # 2. Add digit features
-    df = add_digit_features(df)
-
-    # 3. Build digit targets (NEXT draw)
-    models = {}
+def predict_first_prize_number(df: pd.DataFrame, registry=None) -> int:
+    """
+    Predicts the next first-prize number digit by digit from a feature
+    table with digit features
+    """
+    registry = get_registry() if registry is None else registry
 
+    # Build digit targets (NEXT draw)
     feature_cols = [
         col for col in df.columns
         if col not in [
@@ -43,23 +30,38 @@ def main():
     X = df[feature_cols].iloc[:-1]  # drop last row
     X_last = df[feature_cols].iloc[[-1]]  # for prediction
 
-    print("\n=== Training digit models for FIRST PRIZE ===")
+    targets = {
+        f"first_prize_d{i+1}": df[f"first_prize_d{i+1}"].shift(-1).dropna()
+        for i in range(DIGIT_COUNT)
+    }
+
+    # Fit all digit models concurrently, reusing cached ones when unchanged
+    models = registry.get_or_fit(X, targets)
 
     predicted_digits = []
 
     for i in range(DIGIT_COUNT):
-        target_col = f"first_prize_d{i+1}"
-        y = df[target_col].shift(-1).dropna()
-
-        model = train_digit_model(X, y)
-        models[target_col] = model
+        model = models[f"first_prize_d{i+1}"]
 
         digit_pred = int(round(model.predict(X_last)[0]))
         digit_pred = max(0, min(9, digit_pred))  # clamp
 
         predicted_digits.append(str(digit_pred))
 
-    predicted_number = int("".join(predicted_digits))
+    return int("".join(predicted_digits))
+
+
+@profiled("predict_next_full")
+def main(df: pd.DataFrame = None):
+    # 1-2. Full feature table with digit features (cached per pipeline stage)
+    if df is None:
+        with profile_stage("load") as stage:
+            df = get_pipeline(window=10).run("digits")
+            stage.output(df)
+
+    # 3. Train digit models and predict
+    print("\n=== Training digit models for FIRST PRIZE ===")
+    predicted_number = predict_first_prize_number(df)
 
     print("\n=== Predicted NEXT FIRST PRIZE NUMBER ===")
     print(predicted_number)
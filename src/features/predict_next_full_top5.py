@@ -1,18 +1,21 @@
 import pandas as pd
 import numpy as np
-from itertools import product
-from collections import defaultdict
 
-from src.features.predict_next_full import train_digit_model
-from src.features.digit_features import add_digit_features
-from src.features.combined_features import build_feature_table
+from src.models.candidates import top_k_numbers
+from src.models.registry import get_registry
+from src.models.votes import digit_vote_distribution
+from src.utils.profiling import profile_stage, profiled
+from src.features.pipeline import get_pipeline
 
 DIGIT_COUNT = 6
 
 
-def main():
-    df = build_feature_table(window=10)
-    df = add_digit_features(df)
+def predict_top5_numbers(df: pd.DataFrame, registry=None, k: int = 5) -> pd.DataFrame:
+    """
+    Top-k full first-prize numbers for the next draw from per-position
+    digit distributions of the digit models
+    """
+    registry = get_registry() if registry is None else registry
 
     feature_cols = [
         col for col in df.columns
@@ -26,31 +29,35 @@ def main():
     X = df[feature_cols].iloc[:-1]
     X_last = df[feature_cols].iloc[[-1]]
 
-    digit_probs = []
+    targets = {
+        f"first_prize_d{i+1}": df[f"first_prize_d{i+1}"].shift(-1).dropna()
+        for i in range(DIGIT_COUNT)
+    }
+    models = registry.get_or_fit(X, targets)
 
-    for i in range(DIGIT_COUNT):
-        y = df[f"first_prize_d{i+1}"].shift(-1).dropna()
-        model = train_digit_model(X, y)
+    # Digit distribution per position via tree voting, in one batched call
+    with profile_stage("votes"):
+        position_models = [models[f"first_prize_d{i+1}"] for i in range(DIGIT_COUNT)]
+        position_probs = digit_vote_distribution(position_models, X_last)[0]
 
-        # Predict distribution via tree voting
-        preds = np.array([tree.predict(X_last)[0] for tree in model.estimators_])
-        digits, counts = np.unique(preds.round().astype(int), return_counts=True)
+    # Top-k full numbers without enumerating every digit combination
+    with profile_stage("top_k") as stage:
+        top = top_k_numbers(position_probs, k=k)
+        stage.output(top)
+    return top
 
-        probs = dict(zip(digits, counts / counts.sum()))
-        digit_probs.append(probs)
 
-    # Generate combinations (top-5)
-    candidates = []
+@profiled("predict_next_full_top5")
+def main(df: pd.DataFrame = None):
+    if df is None:
+        with profile_stage("load") as stage:
+            df = get_pipeline(window=10).run("digits")
+            stage.output(df)
 
-    for combo in product(*[list(p.keys()) for p in digit_probs]):
-        prob = np.prod([digit_probs[i].get(combo[i], 0) for i in range(DIGIT_COUNT)])
-        number = int("".join(map(str, combo)))
-        candidates.append((number, prob))
-
-    top5 = sorted(candidates, key=lambda x: x[1], reverse=True)[:5]
+    top5 = predict_top5_numbers(df, k=5)
 
     print("\n=== TOP 5 FULL NUMBER PREDICTIONS ===")
-    for num, prob in top5:
+    for num, prob in top5.itertuples(index=False):
         print(num, f"(prob={prob:.6f})")
 
 
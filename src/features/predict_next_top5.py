@@ -3,20 +3,29 @@
 import pandas as pd
 import numpy as np
 from src.data.clean import clean_data
+from src.data.load import PRIZE_COLS
+from src.utils.profiling import profile_stage, profiled
+from src.features.digit_features import DIGIT_COUNT, digit_tensor
+from src.features.pipeline import get_pipeline
 from src.features.rolling_features import add_rolling_features
-from src.features.transition_features import add_transition_features, build_last_digit_transition_matrix, transition_probability_matrix
+from src.models.markov import MarkovModel
+from src.features.transition_features import add_transition_features, build_last_digit_transition_matrix, build_positional_transition_tensor, transition_probability_matrix
 
-def load_and_prepare(file_path="outputs/prizebond_features.csv"):
+def load_and_prepare(file_path=None, window: int = 10):
     """
-    Load feature CSV, clean, and add rolling & transition features
+    Load the feature table with rolling & transition features.
+    A CSV `file_path` of raw draws is cleaned and featurised instead.
     """
+    if file_path is None:
+        return get_pipeline(window=window).run("transition")
+
     df = pd.read_csv(file_path)
 
     # Clean data
     df = clean_data(df)
 
     # Add rolling features
-    df = add_rolling_features(df, window=10)
+    df = add_rolling_features(df, window=window)
 
     # Add transition features for all prize columns
     df = add_transition_features(df)
@@ -51,16 +60,76 @@ def predict_top5_last_digits(df: pd.DataFrame, prize_col="first_prize", top_n=5)
 
     return predictions
 
-def main():
-    df = load_and_prepare()
+def predict_top5_position_digits(df: pd.DataFrame, prize_col="first_prize", top_n=5):
+    """
+    Predict Top N most likely digits at every position (d1-d6) for the next
+    draw of a prize column, from per-position digit transitions
+    """
+    values = df[prize_col].to_numpy()
+    prob_tensor = transition_probability_matrix(build_positional_transition_tensor(values))[0]
+
+    # Digits of the last observed number, most significant first
+    last_digits = digit_tensor(values[-1:])[0].astype(int)
+    next_digit_probs = prob_tensor[np.arange(DIGIT_COUNT), last_digits]
 
-    prize_columns = ["first_prize", "second_prize_1", "second_prize_2", "second_prize_3"]
+    top_digits = np.argsort(next_digit_probs, axis=1)[:, ::-1][:, :top_n]
+    top_probs = np.take_along_axis(next_digit_probs, top_digits, axis=1)
+
+    predictions = pd.DataFrame({
+        "position": np.repeat([f"d{k+1}" for k in range(DIGIT_COUNT)], top_digits.shape[1]),
+        "predicted_digit": top_digits.ravel(),
+        "probability": top_probs.ravel()
+    })
+
+    return predictions
+
+def predict_top5_markov_digits(df: pd.DataFrame, prize_col="first_prize", orders=(1, 2, 3),
+                               top_n=5, smoothing="kneser_ney"):
+    """
+    Predict Top N most likely last digits for the next draw of a prize column
+    under order-k Markov models of the last-digit sequence, one ranking per order
+    """
+    last_digits = df[prize_col].to_numpy() % 10
+
+    frames = []
+    for order in orders:
+        model = MarkovModel(order=order, alphabet=10, smoothing=smoothing).fit(last_digits)
+        next_digit_probs = model.predict_next(last_digits)
+
+        top_digits = np.argsort(next_digit_probs)[::-1][:top_n]
+        frames.append(pd.DataFrame({
+            "order": order,
+            "predicted_last_digit": top_digits,
+            "probability": next_digit_probs[top_digits]
+        }))
+
+    return pd.concat(frames, ignore_index=True)
+
+@profiled("predict_next_top5")
+def main(df: pd.DataFrame = None, positions: bool = False, markov: bool = False):
+    """
+    Prints the top 5 last digits of every prize column; with `positions`,
+    also the top 5 digits at each of the six positions, and with `markov`,
+    the top 5 last digits under order 1-3 Markov models
+    """
+    if df is None:
+        with profile_stage("load") as stage:
+            df = load_and_prepare()
+            stage.output(df)
 
     print("=== Next Prize Bond Top 5 Predictions ===")
-    for col in prize_columns:
+    for col in PRIZE_COLS:
         top5 = predict_top5_last_digits(df, prize_col=col, top_n=5)
         print(f"\n{col} Top 5 Predicted Last Digits:")
         print(top5)
 
+        if positions:
+            print(f"\n{col} Top 5 Predicted Digits per Position:")
+            print(predict_top5_position_digits(df, prize_col=col, top_n=5).to_string(index=False))
+
+        if markov:
+            print(f"\n{col} Top 5 Predicted Last Digits (Markov, order 1-3):")
+            print(predict_top5_markov_digits(df, prize_col=col, top_n=5).to_string(index=False))
+
 if __name__ == "__main__":
     main()
@@ -3,9 +3,14 @@
 import pandas as pd
 import numpy as np
 from src.data.clean import clean_data
+from src.data.load import PRIZE_COLS
+from src.utils.profiling import profile_stage, profiled
+from src.features.feature_store import get_feature_table
 from src.features.transition_features import build_last_digit_transition_matrix, transition_probability_matrix
 
-def load_and_prepare(file_path="outputs/prizebond_features.csv"):
+def load_and_prepare(file_path=None, window: int = 10):
+    if file_path is None:
+        return get_feature_table(window=window)
     df = pd.read_csv(file_path)
     df = clean_data(df)
     return df
@@ -38,13 +43,14 @@ def generate_full_candidates(df, prize_col, top_digits):
     candidates = [number_base + d for d in top_digits]
     return candidates
 
+@profiled("predict_next_top5_visual")
 def main():
-    df = load_and_prepare()
-
-    prize_cols = ['first_prize', 'second_prize_1', 'second_prize_2', 'second_prize_3']
+    with profile_stage("load") as stage:
+        df = load_and_prepare()
+        stage.output(df)
 
     print("\n=== Next Prize Bond Top 5 Full Number Predictions ===\n")
-    for col in prize_cols:
+    for col in PRIZE_COLS:
         top_digits, top_probs = predict_next_last_digits(df, col)
         full_candidates = generate_full_candidates(df, col, top_digits)
 
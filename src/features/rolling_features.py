@@ -1,10 +1,15 @@
 import numpy as np
 import pandas as pd
-from scipy.stats import entropy
+
+from src.data.load import PRIZE_COLS
+from src.features.feature_block import with_columns
+from src.features.window_engine import sliding_window_stats
 
 
 def last_digit_entropy(series: pd.Series) -> float:
     """Entropy of last digits in a window"""
+    from scipy.stats import entropy  # scipy.stats is slow to import; only needed here
+
     digits = series.astype(int) % 10
     counts = np.bincount(digits, minlength=10)
     probs = counts / counts.sum() if counts.sum() > 0 else np.zeros(10)
@@ -29,7 +34,40 @@ def digit_dominance(series: pd.Series) -> float:
     return counts.max() - counts.mean()
 
 
-def add_rolling_features(df: pd.DataFrame, window: int = 10) -> pd.DataFrame:
+def rolling_feature_columns(values: np.ndarray, window=10, prize_cols=PRIZE_COLS) -> dict:
+    """
+    New columns of `add_rolling_features` as arrays, computed from the
+    (draws, prizes) array of prize numbers
+    """
+    windows = [window] if np.isscalar(window) else list(window)
+
+    # All statistics for all prize columns and windows in one sliding pass
+    stats = sliding_window_stats(values, windows)
+
+    columns = {}
+    for w in windows:
+        for i, col in enumerate(prize_cols):
+            # Rolling mean
+            columns[f'rolling_mean_{col}_{w}'] = stats[w]["mean"][:, i]
+            # Rolling standard deviation
+            columns[f'rolling_std_{col}_{w}'] = np.nan_to_num(stats[w]["std"][:, i], nan=0.0)
+            # Last-digit entropy
+            columns[f'rolling_entropy_{col}_{w}'] = stats[w]["entropy"][:, i]
+            # Runs count
+            columns[f'rolling_runs_{col}_{w}'] = stats[w]["runs"][:, i]
+            # Digit dominance
+            columns[f'rolling_digit_dominance_{col}_{w}'] = stats[w]["dominance"][:, i]
+
+    # --- Generic columns for backward compatibility (NaNs filled with 0) ---
+    window = windows[0]
+    for stat in ['mean', 'std', 'entropy', 'runs', 'digit_dominance']:
+        values = columns[f'rolling_{stat}_first_prize_{window}']
+        columns[f'rolling_{stat}'] = np.where(np.isnan(values), 0, values)
+
+    return columns
+
+
+def add_rolling_features(df: pd.DataFrame, window=10) -> pd.DataFrame:
     """
     Adds rolling features for all prize columns:
     - Rolling mean
@@ -38,47 +76,16 @@ def add_rolling_features(df: pd.DataFrame, window: int = 10) -> pd.DataFrame:
     - Runs count
     - Digit dominance
 
-    Also adds generic columns for first_prize to maintain backward compatibility:
+    `window` may be a single size or a list of sizes; every window is
+    computed from the same prefix sums, so a sweep costs little more than
+    one window.
+
+    Also adds generic columns for first_prize (first window) to maintain
+    backward compatibility:
     - rolling_mean
     - rolling_std
     - rolling_entropy
     - rolling_runs
     - rolling_digit_dominance
     """
-
-    df = df.copy()
-    prize_cols = ['first_prize', 'second_prize_1', 'second_prize_2', 'second_prize_3']
-
-    for col in prize_cols:
-        # Rolling mean
-        df[f'rolling_mean_{col}_{window}'] = df[col].rolling(window, min_periods=1).mean()
-        # Rolling standard deviation
-        df[f'rolling_std_{col}_{window}'] = df[col].rolling(window, min_periods=1).std().fillna(0)
-        # Last-digit entropy
-        df[f'rolling_entropy_{col}_{window}'] = df[col].rolling(window, min_periods=1).apply(
-            last_digit_entropy, raw=False
-        )
-        # Runs count
-        df[f'rolling_runs_{col}_{window}'] = df[col].rolling(window, min_periods=1).apply(
-            runs_count, raw=False
-        )
-        # Digit dominance
-        df[f'rolling_digit_dominance_{col}_{window}'] = df[col].rolling(window, min_periods=1).apply(
-            digit_dominance, raw=False
-        )
-
-    # --- Generic columns for backward compatibility ---
-    df['rolling_mean'] = df[f'rolling_mean_first_prize_{window}']
-    df['rolling_std'] = df[f'rolling_std_first_prize_{window}']
-    df['rolling_entropy'] = df[f'rolling_entropy_first_prize_{window}']
-    df['rolling_runs'] = df[f'rolling_runs_first_prize_{window}']
-    df['rolling_digit_dominance'] = df[f'rolling_digit_dominance_first_prize_{window}']
-
-    # Fill NaNs safely
-    df['rolling_mean'] = df['rolling_mean'].fillna(0)
-    df['rolling_std'] = df['rolling_std'].fillna(0)
-    df['rolling_entropy'] = df['rolling_entropy'].fillna(0)
-    df['rolling_runs'] = df['rolling_runs'].fillna(0)
-    df['rolling_digit_dominance'] = df['rolling_digit_dominance'].fillna(0)
-
-    return df
+    return with_columns(df, rolling_feature_columns(df[PRIZE_COLS].to_numpy(), window))
@@ -0,0 +1,102 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from src.data.load import PRIZE_COLS
+
+# Column families of the feature table, matched on the column name
+DIGIT_PATTERN = re.compile(r"(last_digit|_d[1-6])$")
+FLAG_PATTERN = re.compile(r"(^|_)is_anomaly(_\d+)?$")
+COUNT_PATTERN = re.compile(r"^rolling_runs_")
+NUMBER_COLS = ["draw_no"] + PRIZE_COLS
+CATEGORY_COLS = ["city", "denomination"]
+
+
+def compat_aliases(window: int = 10) -> dict:
+    """
+    Generic backward-compatibility column -> the first_prize column it
+    duplicates. `transition_prob` and `transition_surprise` are not
+    listed: they differ from their source on the first draw (0 vs NaN).
+    """
+    return {
+        "rolling_mean": f"rolling_mean_first_prize_{window}",
+        "rolling_std": f"rolling_std_first_prize_{window}",
+        "rolling_entropy": f"rolling_entropy_first_prize_{window}",
+        "rolling_runs": f"rolling_runs_first_prize_{window}",
+        "rolling_digit_dominance": f"rolling_digit_dominance_first_prize_{window}",
+        "last_digit": "first_prize_last_digit",
+        "prev_last_digit": "first_prize_prev_last_digit",
+    }
+
+
+def compact_values(name: str, series: pd.Series):
+    """
+    Compact representation of one feature column:
+    - digits (last/prev digit, d1..d6) -> uint8, a missing previous digit as 0
+    - anomaly flags -> bool
+    - run counts -> smallest unsigned integer type that holds them
+    - draw and prize numbers -> int32
+    - city -> categorical
+    - any other float -> float32
+    Other columns are returned unchanged.
+    """
+    if name in CATEGORY_COLS:
+        return pd.Categorical(series)
+    if not pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+        return series.array
+
+    values = series.to_numpy()
+    if DIGIT_PATTERN.search(name):
+        return np.nan_to_num(values, nan=0).astype(np.uint8)
+    if FLAG_PATTERN.search(name):
+        return values.astype(bool)
+    if name in NUMBER_COLS:
+        return values.astype(np.int32)
+    if COUNT_PATTERN.search(name):
+        counts = np.nan_to_num(values, nan=0)
+        return counts.astype(np.min_scalar_type(int(counts.max()) if len(counts) else 0))
+    if np.issubdtype(values.dtype, np.floating):
+        return values.astype(np.float32)
+    return values
+
+
+def compact_feature_table(df: pd.DataFrame, window: int = 10) -> pd.DataFrame:
+    """
+    Feature table with compact dtypes (see `compact_values`) in which every
+    generic compatibility column of `compat_aliases` is the same array as
+    its first_prize column instead of a copy. Column order is unchanged.
+
+    Aliases share memory until written: under copy-on-write, assigning into
+    one of them copies that column only. A deep `df.copy()` materialises them.
+    """
+    aliases = {alias: source for alias, source in compat_aliases(window).items()
+               if alias in df.columns and source in df.columns}
+
+    columns = {}
+    for col in df.columns:
+        if col not in aliases:
+            columns[col] = compact_values(col, df[col])
+    for alias, source in aliases.items():
+        columns[alias] = columns[source]
+
+    return pd.DataFrame({col: columns[col] for col in df.columns}, index=df.index, copy=False)
+
+
+def table_nbytes(df: pd.DataFrame) -> int:
+    """
+    Bytes held by the columns of `df`, counting memory shared by several
+    columns (aliases) once. `DataFrame.memory_usage` counts it per column.
+    """
+    seen = set()
+    total = 0
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, np.dtype):
+            values = series.to_numpy()
+            key = (values.__array_interface__["data"][0], values.nbytes)
+            if key in seen:
+                continue
+            seen.add(key)
+        total += int(series.memory_usage(index=False, deep=True))
+    return total
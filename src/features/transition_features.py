@@ -1,31 +1,141 @@
 import numpy as np
 import pandas as pd
 
+from src.data.load import PRIZE_COLS
+from src.features.digit_features import DIGIT_COUNT, digit_tensor
+from src.features.feature_block import with_columns
+
+
+def build_transition_tensor(values: np.ndarray) -> np.ndarray:
+    """
+    Builds a (prize, prev, cur) last-digit transition count tensor.
+    `values` is a (draws, prizes) integer array; cell [p, i, j] counts how
+    many times digit j followed digit i in prize column p.
+    """
+    values = np.asarray(values)
+    if values.ndim == 1:
+        values = values[:, None]
+    n_prizes = values.shape[1]
+
+    digits = values.astype(np.int64) % 10
+    prize_idx = np.arange(n_prizes)
+    flat_idx = prize_idx * 100 + digits[:-1] * 10 + digits[1:]
+    counts = np.bincount(flat_idx.ravel(), minlength=n_prizes * 100)
+    return counts.reshape(n_prizes, 10, 10)
+
+
+def build_positional_transition_tensor(values: np.ndarray) -> np.ndarray:
+    """
+    Builds a (prize, position, prev, cur) transition count tensor over all
+    six digit positions with a single bincount.
+    Cell [p, k, i, j] counts how many times digit j at position k+1 of prize
+    column p followed digit i at the same position.
+    """
+    values = np.asarray(values)
+    if values.ndim == 1:
+        values = values[:, None]
+    n_prizes = values.shape[1]
+
+    digits = digit_tensor(values).astype(np.int64)
+    cell = np.arange(n_prizes)[:, None] * DIGIT_COUNT + np.arange(DIGIT_COUNT)
+    flat_idx = cell * 100 + digits[:-1] * 10 + digits[1:]
+    counts = np.bincount(flat_idx.ravel(), minlength=n_prizes * DIGIT_COUNT * 100)
+    return counts.reshape(n_prizes, DIGIT_COUNT, 10, 10)
+
 
 def build_last_digit_transition_matrix(series: pd.Series) -> np.ndarray:
     """
     Builds a 10x10 last-digit transition count matrix.
     Each cell [i,j] counts how many times digit j followed digit i.
     """
-    digits = series.astype(int) % 10
-    matrix = np.zeros((10, 10), dtype=int)
-    for i in range(1, len(digits)):
-        prev_d = digits.iloc[i - 1]
-        curr_d = digits.iloc[i]
-        matrix[prev_d, curr_d] += 1
-    return matrix
+    return build_transition_tensor(series.to_numpy())[0]
 
 
 def transition_probability_matrix(matrix: np.ndarray) -> np.ndarray:
     """
-    Converts a count matrix to a probability matrix
+    Converts a count matrix (or a stack of them) to a probability matrix.
+    Rows without any observed transition stay at zero.
     """
     prob_matrix = matrix.astype(float)
-    row_sums = prob_matrix.sum(axis=1, keepdims=True)
-    prob_matrix = np.divide(prob_matrix, row_sums, where=row_sums != 0)
+    row_sums = prob_matrix.sum(axis=-1, keepdims=True)
+    prob_matrix = np.divide(prob_matrix, row_sums, out=np.zeros_like(prob_matrix), where=row_sums != 0)
     return prob_matrix
 
 
+def _running_counts(keys: np.ndarray) -> np.ndarray:
+    """
+    For every position, how many times its key occurred up to and including it
+    """
+    keys = keys.ravel()
+    order = np.argsort(keys, kind="stable")
+    ordered = keys[order]
+    starts = np.r_[True, ordered[1:] != ordered[:-1]]
+    group_start = np.maximum.accumulate(np.where(starts, np.arange(len(keys)), 0))
+    counts = np.empty(len(keys), dtype=np.int64)
+    counts[order] = np.arange(len(keys)) - group_start + 1
+    return counts
+
+
+def prefix_transition_probabilities(last_digits: np.ndarray) -> np.ndarray:
+    """
+    P(cur | prev) of rows 1.. of a (draws, prizes) last-digit array, each
+    estimated from the transitions up to and including that row only
+    """
+    n_pairs, n_prizes = last_digits.shape[0] - 1, last_digits.shape[1]
+    prize_idx = np.arange(n_prizes)
+    prev, cur = last_digits[:-1], last_digits[1:]
+    pair_counts = _running_counts((prize_idx * 10 + prev) * 10 + cur)
+    prev_counts = _running_counts(prize_idx * 10 + prev)
+    return (pair_counts / prev_counts).reshape(n_pairs, n_prizes)
+
+
+def transition_feature_columns(values: np.ndarray, prize_cols=PRIZE_COLS, prefix: bool = False) -> dict:
+    """
+    New columns of `add_transition_features` as arrays, computed from the
+    (draws, prizes) array of prize numbers.
+
+    By default the probabilities come from the transitions of all rows.
+    With `prefix`, each row's come from the transitions up to and including
+    it, so for values ordered oldest first no row sees a later draw.
+    """
+    last_digits = values.astype(np.int64) % 10
+    n_rows = len(values)
+
+    # Look up P(cur | prev) for every row and prize; first row has no predecessor
+    probs = np.full((n_rows, len(prize_cols)), np.nan)
+    prev_digits = np.full((n_rows, len(prize_cols)), np.nan)
+    if n_rows > 1:
+        if prefix:
+            probs[1:] = prefix_transition_probabilities(last_digits)
+        else:
+            # Build transition tensor for all prize columns at once
+            prob_tensor = transition_probability_matrix(build_transition_tensor(values))
+            prize_idx = np.arange(len(prize_cols))
+            probs[1:] = prob_tensor[prize_idx, last_digits[:-1], last_digits[1:]]
+        prev_digits[1:] = last_digits[:-1]
+
+    surprises = -np.log(np.where(probs > 0, probs, np.nan))
+
+    columns = {}
+    for i, col in enumerate(prize_cols):
+        # Per-prize columns
+        columns[f'{col}_last_digit'] = last_digits[:, i]
+        columns[f'{col}_prev_last_digit'] = prev_digits[:, i]
+
+        # Transition probability and surprise (-log(prob))
+        columns[f'{col}_transition_prob'] = probs[:, i]
+        columns[f'{col}_transition_surprise'] = surprises[:, i]
+
+    # --- Generic columns for backward compatibility ---
+    columns['last_digit'] = last_digits[:, 0].copy()
+    columns['prev_last_digit'] = prev_digits[:, 0].copy()
+    # Fill NaNs safely
+    columns['transition_prob'] = np.where(np.isnan(probs[:, 0]), 0.0, probs[:, 0])
+    columns['transition_surprise'] = np.where(np.isnan(surprises[:, 0]), 0.0, surprises[:, 0])
+
+    return columns
+
+
 def add_transition_features(df: pd.DataFrame) -> pd.DataFrame:
     """
     Adds transition features for all prize columns:
@@ -40,42 +150,42 @@ def add_transition_features(df: pd.DataFrame) -> pd.DataFrame:
     - transition_prob
     - transition_surprise
     """
+    return with_columns(df, transition_feature_columns(df[PRIZE_COLS].to_numpy()))
 
-    df = df.copy()
-    prize_cols = ['first_prize', 'second_prize_1', 'second_prize_2', 'second_prize_3']
-
-    for col in prize_cols:
-        # Build transition matrix
-        count_matrix = build_last_digit_transition_matrix(df[col])
-        prob_matrix = transition_probability_matrix(count_matrix)
 
-        # Compute last digit
-        last_digits = df[col] % 10
-        prev_digits = last_digits.shift(1)
+def positional_transition_feature_columns(values: np.ndarray, prize_cols=PRIZE_COLS) -> dict:
+    """
+    New columns of `add_positional_transition_features` as arrays, computed
+    from the (draws, prizes) array of prize numbers
+    """
+    prob_tensor = transition_probability_matrix(build_positional_transition_tensor(values))
 
-        # Assign per-prize columns
-        df[f'{col}_last_digit'] = last_digits
-        df[f'{col}_prev_last_digit'] = prev_digits
+    digits = digit_tensor(values).astype(np.int64)
+    n_rows = len(values)
 
-        # Compute transition probability
-        def compute_prob(row):
-            if pd.isna(row[f'{col}_prev_last_digit']):
-                return np.nan
-            return prob_matrix[int(row[f'{col}_prev_last_digit']), int(row[f'{col}_last_digit'])]
+    # Look up P(cur | prev) for every row, prize and position; first row has no predecessor
+    probs = np.full((n_rows, len(prize_cols), DIGIT_COUNT), np.nan)
+    if n_rows > 1:
+        prize_idx = np.arange(len(prize_cols))[:, None]
+        position_idx = np.arange(DIGIT_COUNT)
+        probs[1:] = prob_tensor[prize_idx, position_idx, digits[:-1], digits[1:]]
 
-        df[f'{col}_transition_prob'] = df.apply(compute_prob, axis=1)
+    surprises = -np.log(np.where(probs > 0, probs, np.nan))
 
-        # Compute transition surprise
-        df[f'{col}_transition_surprise'] = -np.log(df[f'{col}_transition_prob'].replace(0, np.nan))
+    columns = {}
+    for i, col in enumerate(prize_cols):
+        for k in range(DIGIT_COUNT):
+            columns[f'{col}_d{k+1}_transition_prob'] = probs[:, i, k]
+            columns[f'{col}_d{k+1}_transition_surprise'] = surprises[:, i, k]
+    return columns
 
-    # --- Generic columns for backward compatibility ---
-    df['last_digit'] = df['first_prize_last_digit']
-    df['prev_last_digit'] = df['first_prize_prev_last_digit']
-    df['transition_prob'] = df['first_prize_transition_prob']
-    df['transition_surprise'] = df['first_prize_transition_surprise']
 
-    # Fill NaNs safely
-    df['transition_prob'] = df['transition_prob'].fillna(0)
-    df['transition_surprise'] = df['transition_surprise'].fillna(0)
+def add_positional_transition_features(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Adds transition features for every digit position of every prize column:
+    - {prize}_d{k}_transition_prob
+    - {prize}_d{k}_transition_surprise (-log(prob))
 
-    return df
+    Position d6 is the last digit, so it matches {prize}_transition_prob.
+    """
+    return with_columns(df, positional_transition_feature_columns(df[PRIZE_COLS].to_numpy()))
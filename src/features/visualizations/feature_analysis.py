@@ -2,40 +2,55 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 
-# Load features
-df = pd.read_csv("../outputs/prizebond_features.csv")
-
-# Quick summary
-print("=== Summary Statistics ===")
-print(df.describe())
-print("\n=== Missing Values ===")
-print(df.isna().sum())
-
-# Plot anomalies over draws
-plt.figure(figsize=(12,5))
-plt.plot(df["Draw No."], df["surprise_zscore"], label="Surprise Z-Score")
-plt.scatter(df["Draw No."], df["surprise_zscore"], c=df["is_anomaly"], cmap='coolwarm', s=50, label="Anomaly")
-plt.gca().invert_xaxis()
-plt.xlabel("Draw No.")
-plt.ylabel("Surprise Z-Score")
-plt.title("Anomalies in Prize Bond Draws")
-plt.legend()
-plt.show()
-
-# Correlation heatmap
-plt.figure(figsize=(15,12))
-sns.heatmap(df.corr(), annot=True, fmt=".2f", cmap="coolwarm")
-plt.title("Feature Correlation Matrix")
-plt.show()
-
-# Distribution of rolling and transition features
-rolling_cols = [col for col in df.columns if "rolling" in col]
-transition_cols = ["transition_prob", "transition_surprise"]
-
-plt.figure(figsize=(15,10))
-for i, col in enumerate(rolling_cols + transition_cols, 1):
-    plt.subplot(4, 4, i)
-    sns.histplot(df[col].dropna(), kde=True)
-    plt.title(col)
-plt.tight_layout()
-plt.show()
+from src.features.feature_store import get_feature_table
+from src.features.visualizations.report import ANNOTATE_MAX_COLUMNS, correlation_matrix, downsample
+
+
+def main(df: pd.DataFrame = None):
+    # Load features
+    if df is None:
+        df = get_feature_table(window=10)
+
+    # Quick summary
+    print("=== Summary Statistics ===")
+    print(df.describe())
+    print("\n=== Missing Values ===")
+    print(df.isna().sum())
+
+    # Plot anomalies over draws (long series are downsampled for the line)
+    x, y = downsample(df["draw_no"], df["surprise_zscore"])
+    anomalies = df[df["is_anomaly"] == 1]
+    plt.figure(figsize=(12,5))
+    plt.plot(x, y, label="Surprise Z-Score")
+    plt.scatter(anomalies["draw_no"], anomalies["surprise_zscore"], color='red', s=50, label="Anomaly")
+    plt.gca().invert_xaxis()
+    plt.xlabel("Draw No.")
+    plt.ylabel("Surprise Z-Score")
+    plt.title("Anomalies in Prize Bond Draws")
+    plt.legend()
+    plt.show()
+
+    # Correlation heatmap (cached numeric correlation matrix)
+    corr = correlation_matrix(df)
+    plt.figure(figsize=(15,12))
+    sns.heatmap(corr, annot=len(corr) <= ANNOTATE_MAX_COLUMNS, fmt=".2f", cmap="coolwarm")
+    plt.title("Feature Correlation Matrix")
+    plt.show()
+
+    # Distribution of rolling and transition features
+    rolling_cols = [col for col in df.columns if "rolling" in col]
+    transition_cols = ["transition_prob", "transition_surprise"]
+    cols = rolling_cols + transition_cols
+    nrows = -(-len(cols) // 4)
+
+    plt.figure(figsize=(15, 2.5 * nrows))
+    for i, col in enumerate(cols, 1):
+        plt.subplot(nrows, 4, i)
+        sns.histplot(df[col].dropna(), kde=len(df) <= 100_000)
+        plt.title(col)
+    plt.tight_layout()
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+REPORT_DIR = Path("outputs") / "report"
+CORR_CACHE_DIR = Path("outputs") / "corr_cache"
+MAX_LINE_POINTS = 4_000    # line plots keep the min and max of each bucket
+ANNOTATE_MAX_COLUMNS = 20  # heatmap cell labels only for small matrices
+HIST_BINS = 20
+
+
+# =========================================================
+# Correlation matrix, computed once and cached
+# =========================================================
+
+_CORR_MEMORY = {}
+
+
+def _numeric_key(numeric: pd.DataFrame) -> str:
+    h = hashlib.sha256()
+    h.update(json.dumps([str(col) for col in numeric.columns]).encode())
+    h.update(np.ascontiguousarray(numeric.to_numpy(dtype=float)).tobytes())
+    return h.hexdigest()[:32]
+
+
+def _pearson(numeric: pd.DataFrame) -> np.ndarray:
+    """
+    Pearson correlation of all column pairs over the rows where both are
+    present, like `DataFrame.corr`, computed with a few matrix products.
+    Columns are centred first to keep the sums numerically stable.
+    """
+    values = numeric.to_numpy(dtype=float)
+    present = ~np.isnan(values)
+    values = values - np.nanmean(values, axis=0) if present.any() else values
+    values = np.where(present, values, 0.0)
+    mask = present.astype(float)
+
+    n = mask.T @ mask                      # rows where both columns are present
+    sx = values.T @ mask                   # sum of x over those rows
+    sxx = (values * values).T @ mask       # sum of x^2 over those rows
+    sxy = values.T @ values
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = sxy - sx * sx.T / n
+        var_x = sxx - sx * sx / n
+        corr = cov / np.sqrt(var_x * var_x.T)
+    corr[(n < 2) | (var_x <= 0) | (var_x.T <= 0)] = np.nan
+    return np.clip(corr, -1.0, 1.0)
+
+
+def correlation_matrix(df: pd.DataFrame, cache_dir: Path = CORR_CACHE_DIR) -> pd.DataFrame:
+    """
+    Correlation matrix of the numeric columns of `df`, cached in memory and
+    on disk by a hash of the data so repeated reports reuse it
+    """
+    numeric = df.select_dtypes(include="number")
+    key = _numeric_key(numeric)
+    if key in _CORR_MEMORY:
+        return _CORR_MEMORY[key]
+
+    path = Path(cache_dir) / f"{key}.npy" if cache_dir is not None else None
+    if path is not None and path.exists():
+        corr = np.load(path)
+    else:
+        corr = _pearson(numeric)
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp.npy")
+            np.save(tmp, corr)
+            os.replace(tmp, path)
+
+    result = pd.DataFrame(corr, index=numeric.columns, columns=numeric.columns)
+    _CORR_MEMORY[key] = result
+    return result
+
+
+# =========================================================
+# Downsampling
+# =========================================================
+
+def downsample(x, y, max_points: int = MAX_LINE_POINTS):
+    """
+    Reduces a line to at most `max_points` points by keeping the minimum
+    and maximum of `y` in each of `max_points / 2` consecutive buckets,
+    so spikes stay visible
+    """
+    x, y = np.asarray(x), np.asarray(y, dtype=float)
+    n = len(y)
+    if n <= max_points:
+        return x, y
+
+    n_buckets = max(1, max_points // 2)
+    size = -(-n // n_buckets)
+    padded = np.full(n_buckets * size, np.nan)
+    padded[:n] = y
+    buckets = padded.reshape(n_buckets, size)
+
+    filled = np.where(np.isnan(buckets), np.inf, buckets)
+    lo = np.argmin(filled, axis=1)
+    hi = np.argmax(np.where(np.isnan(buckets), -np.inf, buckets), axis=1)
+    start = np.arange(n_buckets) * size
+
+    keep = np.unique(np.concatenate([start + lo, start + hi]))
+    keep = keep[keep < n]
+    return x[keep], y[keep]
+
+
+# =========================================================
+# Figure renderers: module-level so worker processes can run them.
+# Each gets precomputed, already reduced data and writes one file.
+# =========================================================
+
+def _init_worker():
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def _render_line(path, x, y, title, xlabel, ylabel, label, anomalies=None, invert_x=True):
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(12, 6))
+    ax.plot(x, y, marker='o' if len(x) <= 200 else None, linestyle='-', label=label)
+    if anomalies is not None:
+        ax.scatter(anomalies[0], anomalies[1], color='red', s=100, label="Anomaly", zorder=3)
+    if invert_x:
+        ax.invert_xaxis()
+    ax.set_title(title)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.legend()
+    fig.savefig(path, dpi=100)
+    plt.close(fig)
+    return str(path)
+
+
+def _render_histograms(path, histograms, ncols=4):
+    import matplotlib.pyplot as plt
+
+    nrows = -(-len(histograms) // ncols)
+    single = len(histograms) == 1
+    fig, axes = plt.subplots(nrows, 1 if single else ncols,
+                             figsize=(10, 5) if single else (15, 2.5 * nrows), squeeze=False)
+    for ax, (name, counts, edges) in zip(axes.ravel(), histograms):
+        ax.stairs(counts, edges, fill=True, alpha=0.6)
+        ax.set_title(name if not single else f"Distribution of {name}")
+        if single:
+            ax.set_ylabel("Frequency")
+    for ax in axes.ravel()[len(histograms):]:
+        ax.set_visible(False)
+    fig.tight_layout()
+    fig.savefig(path, dpi=100)
+    plt.close(fig)
+    return str(path)
+
+
+def _render_heatmap(path, corr, labels, title):
+    import matplotlib.pyplot as plt
+
+    n = len(labels)
+    size = min(4 + 0.3 * n, 40)
+    fig, ax = plt.subplots(figsize=(size, size * 0.8))
+    image = ax.imshow(corr, cmap="coolwarm", vmin=-1, vmax=1, interpolation="nearest")
+    fig.colorbar(image, ax=ax)
+    ax.set_xticks(np.arange(n))
+    ax.set_yticks(np.arange(n))
+    fontsize = 8 if n <= 40 else 5
+    ax.set_xticklabels(labels, rotation=90, fontsize=fontsize)
+    ax.set_yticklabels(labels, fontsize=fontsize)
+    if n <= ANNOTATE_MAX_COLUMNS:
+        for i in range(n):
+            for j in range(n):
+                if not np.isnan(corr[i, j]):
+                    ax.text(j, i, f"{corr[i, j]:.2f}", ha="center", va="center", fontsize=7)
+    ax.set_title(title)
+    fig.tight_layout()
+    fig.savefig(path, dpi=100)
+    plt.close(fig)
+    return str(path)
+
+
+def _histogram(values, bins=HIST_BINS):
+    values = np.asarray(values, dtype=float)
+    values = values[np.isfinite(values)]
+    if len(values) == 0:
+        return np.zeros(bins), np.linspace(0, 1, bins + 1)
+    return np.histogram(values, bins=bins)
+
+
+# =========================================================
+# Report
+# =========================================================
+
+def report_jobs(df: pd.DataFrame, window: int, out_dir: Path,
+                max_points: int = MAX_LINE_POINTS, cache_dir: Path = CORR_CACHE_DIR) -> list:
+    """
+    (renderer, kwargs) for every figure of `visualize_features` and
+    `feature_analysis`, with data already downsampled or binned
+    """
+    out_dir = Path(out_dir)
+    # Correlation does not depend on row order: key the cache on the caller's frame
+    corr = correlation_matrix(df, cache_dir)
+    df = df.sort_values("draw_no", ascending=False)
+    draw_no = df["draw_no"].to_numpy()
+    rolling_col = f"rolling_mean_first_prize_{window}"
+    anomalies = df[df["is_anomaly"] == 1]
+
+    x, y = downsample(draw_no, df[rolling_col], max_points)
+    zx, zy = downsample(draw_no, df["surprise_zscore"], max_points)
+
+    rolling_cols = [col for col in df.columns if "rolling" in col]
+    transition_cols = ["transition_prob", "transition_surprise"]
+
+    return [
+        (_render_line, dict(
+            path=out_dir / "rolling_mean.png", x=x, y=y,
+            title=f"Rolling Mean (Window={window}) Across Draws",
+            xlabel="Draw No.", ylabel="Rolling Mean", label=f"Rolling Mean {window}")),
+        (_render_line, dict(
+            path=out_dir / "rolling_mean_anomalies.png", x=x, y=y,
+            title="Rolling Mean with Anomalies Highlighted",
+            xlabel="Draw No.", ylabel="Rolling Mean", label=f"Rolling Mean {window}",
+            anomalies=(anomalies["draw_no"].to_numpy(), anomalies[rolling_col].to_numpy()))),
+        (_render_line, dict(
+            path=out_dir / "surprise_zscore_anomalies.png", x=zx, y=zy,
+            title="Anomalies in Prize Bond Draws",
+            xlabel="Draw No.", ylabel="Surprise Z-Score", label="Surprise Z-Score",
+            anomalies=(anomalies["draw_no"].to_numpy(), anomalies["surprise_zscore"].to_numpy()))),
+        (_render_histograms, dict(
+            path=out_dir / "transition_surprise_hist.png",
+            histograms=[("Transition Surprise", *_histogram(df["transition_surprise"]))])),
+        (_render_histograms, dict(
+            path=out_dir / "feature_distributions.png",
+            histograms=[(col, *_histogram(df[col])) for col in rolling_cols + transition_cols])),
+        (_render_heatmap, dict(
+            path=out_dir / "correlation_heatmap.png", corr=corr.to_numpy(),
+            labels=[str(col) for col in corr.columns],
+            title="Feature Correlation Heatmap (Numeric Columns Only)")),
+    ]
+
+
+def build_report(df: pd.DataFrame, window: int = 10, out_dir: Path = REPORT_DIR,
+                 n_jobs: int = None, max_points: int = MAX_LINE_POINTS,
+                 cache_dir: Path = CORR_CACHE_DIR) -> list:
+    """
+    Renders every feature figure to PNG files in `out_dir` with the Agg
+    backend, spread over `n_jobs` worker processes, and writes summary
+    statistics and missing-value counts as CSV. Returns the written paths.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    jobs = report_jobs(df, window, out_dir, max_points, cache_dir)
+
+    n_jobs = min(n_jobs or os.cpu_count() or 1, len(jobs))
+    if n_jobs == 1:
+        _init_worker()
+        paths = [render(**kwargs) for render, kwargs in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker) as executor:
+            futures = [executor.submit(render, **kwargs) for render, kwargs in jobs]
+            paths = [future.result() for future in futures]
+
+    df.describe().to_csv(out_dir / "summary_statistics.csv")
+    df.isna().sum().rename("missing").to_csv(out_dir / "missing_values.csv")
+    return paths + [str(out_dir / "summary_statistics.csv"), str(out_dir / "missing_values.csv")]
+
+
+def main(argv=None):
+    from src.features.feature_store import get_feature_table
+
+    parser = argparse.ArgumentParser(description="Render all feature figures to files without a display")
+    parser.add_argument("--window", type=int, default=10, help="rolling window of the feature table")
+    parser.add_argument("--out", default=str(REPORT_DIR), help="output directory")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--max-points", type=int, default=MAX_LINE_POINTS, help="points per line plot")
+    args = parser.parse_args(argv)
+
+    df = get_feature_table(window=args.window)
+    for path in build_report(df, args.window, args.out, args.jobs, args.max_points):
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
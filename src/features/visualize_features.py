@@ -4,25 +4,29 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+from src.features.feature_store import get_feature_table
+from src.features.visualizations.report import ANNOTATE_MAX_COLUMNS, correlation_matrix
+
 # Make plots look nicer
 sns.set(style="whitegrid")
 
-def main():
+def main(df: pd.DataFrame = None, window: int = 10):
     # Load the combined feature table
-    df = pd.read_csv("outputs/prizebond_features.csv")
+    if df is None:
+        df = get_feature_table(window=window)
     print("=== Top 5 Rows ===")
     print(df.head())
 
     # Ensure Draw No. is sorted descending (latest draw first)
-    df = df.sort_values("Draw No.", ascending=False)
+    df = df.sort_values("draw_no", ascending=False)
 
     # ===============================
     # 1. Rolling Mean Plot
     # ===============================
     plt.figure(figsize=(12, 6))
-    plt.plot(df["Draw No."], df["rolling_mean_10"], marker='o', linestyle='-', label="Rolling Mean 10")
+    plt.plot(df["draw_no"], df[f"rolling_mean_first_prize_{window}"], marker='o', linestyle='-', label=f"Rolling Mean {window}")
     plt.gca().invert_xaxis()
-    plt.title("Rolling Mean (Window=10) Across Draws")
+    plt.title(f"Rolling Mean (Window={window}) Across Draws")
     plt.xlabel("Draw No.")
     plt.ylabel("Rolling Mean")
     plt.legend()
@@ -32,9 +36,9 @@ def main():
     # 2. Rolling Mean with Anomalies
     # ===============================
     plt.figure(figsize=(12, 6))
-    plt.plot(df["Draw No."], df["rolling_mean_10"], marker='o', linestyle='-', label="Rolling Mean 10")
+    plt.plot(df["draw_no"], df[f"rolling_mean_first_prize_{window}"], marker='o', linestyle='-', label=f"Rolling Mean {window}")
     anomalies = df[df["is_anomaly"] == 1]
-    plt.scatter(anomalies["Draw No."], anomalies["rolling_mean_10"], color='red', s=100, label="Anomaly")
+    plt.scatter(anomalies["draw_no"], anomalies[f"rolling_mean_first_prize_{window}"], color='red', s=100, label="Anomaly")
     plt.gca().invert_xaxis()
     plt.title("Rolling Mean with Anomalies Highlighted")
     plt.xlabel("Draw No.")
@@ -57,10 +61,10 @@ def main():
     # ===============================
     plt.figure(figsize=(12, 8))
 
-    # Select only numeric columns
-    numeric_df = df.select_dtypes(include='number')
+    # Numeric columns only; the matrix is cached and shared with the batch report
+    corr = correlation_matrix(df)
 
-    sns.heatmap(numeric_df.corr(), annot=True, fmt=".2f", cmap="coolwarm")
+    sns.heatmap(corr, annot=len(corr) <= ANNOTATE_MAX_COLUMNS, fmt=".2f", cmap="coolwarm")
     plt.title("Feature Correlation Heatmap (Numeric Columns Only)")
     plt.show()
 
@@ -0,0 +1,104 @@
+import numpy as np
+
+DIGIT_BASE = 10
+CHUNK_SIZE = 65536  # rows per block; bounds the (rows, prizes, 10) count buffer
+
+
+def _one_hot(digits: np.ndarray) -> np.ndarray:
+    """One-hot encodes an integer digit array along a new trailing axis"""
+    return (digits[..., None] == np.arange(DIGIT_BASE)).astype(np.int32)
+
+
+def _prefix(x: np.ndarray) -> np.ndarray:
+    """Cumulative sum along axis 0 with a leading zero row"""
+    out = np.zeros((x.shape[0] + 1,) + x.shape[1:], dtype=x.dtype)
+    np.cumsum(x, axis=0, out=out[1:])
+    return out
+
+
+def sliding_window_stats(values: np.ndarray, windows, chunk_size: int = CHUNK_SIZE) -> dict:
+    """
+    Computes windowed statistics for several prize columns and several
+    window sizes in one pass.
+
+    `values` is a (draws, prizes) array. Prefix sums, prefix sums of
+    squares, cumulative one-hot last-digit counts and cumulative run
+    boundaries are built once per block of rows (with `max(windows)` rows
+    of look-back), and every window is then a subtraction of two prefix
+    rows. Integer inputs are centred and summed exactly in int64.
+
+    Returns {window: {stat: (draws, prizes) float array}} matching the pandas
+    `rolling(window, min_periods=1)` semantics of:
+    - "mean", "std" (NaN for single-draw windows, like pandas)
+    - "entropy": last_digit_entropy
+    - "runs": runs_count
+    - "dominance": digit_dominance
+    """
+    values = np.asarray(values)
+    if values.ndim == 1:
+        values = values[:, None]
+    windows = sorted({int(w) for w in windows})
+    if not windows or windows[0] < 1:
+        raise ValueError("windows must be >= 1")
+
+    n_rows, n_cols = values.shape
+    max_window = windows[-1]
+
+    if np.issubdtype(values.dtype, np.integer):
+        offset = (int(values.min()) + int(values.max())) // 2 if n_rows else 0
+        centered = values.astype(np.int64) - offset
+    else:
+        offset = float(np.nanmean(values)) if n_rows else 0.0
+        centered = values.astype(float) - offset
+    digits = values.astype(np.int64) % DIGIT_BASE
+
+    # Run boundary b[t] = 1 when draw t differs from draw t-1
+    boundaries = np.zeros((n_rows, n_cols), dtype=np.int32)
+    if n_rows > 1:
+        boundaries[1:] = values[1:] != values[:-1]
+
+    # c * log(c) for every possible in-window count; entropy of a window of
+    # length n is log(n) - sum(c * log(c)) / n
+    count_range = np.arange(max_window + 1, dtype=float)
+    c_log_c = np.zeros(max_window + 1)
+    c_log_c[1:] = count_range[1:] * np.log(count_range[1:])
+
+    stat_names = ("mean", "std", "entropy", "runs", "dominance")
+    out = {w: {stat: np.empty((n_rows, n_cols), dtype=float) for stat in stat_names}
+           for w in windows}
+
+    for start in range(0, n_rows, chunk_size):
+        stop = min(start + chunk_size, n_rows)
+        origin = max(0, start - max_window)
+
+        p_sum = _prefix(centered[origin:stop])
+        p_sq = _prefix(centered[origin:stop] * centered[origin:stop])
+        p_counts = _prefix(_one_hot(digits[origin:stop]))
+        p_bounds = _prefix(boundaries[origin:stop])
+
+        rows = np.arange(start, stop)
+        end = rows - origin + 1
+
+        for w in windows:
+            # Window length grows until it reaches w (min_periods=1)
+            lengths = np.minimum(rows + 1, w)
+            begin = end - lengths
+            n = lengths[:, None].astype(float)
+
+            s1 = (p_sum[end] - p_sum[begin]).astype(float)
+            s2 = (p_sq[end] - p_sq[begin]).astype(float)
+            counts = p_counts[end] - p_counts[begin]
+            inner_bounds = p_bounds[end] - p_bounds[np.minimum(begin + 1, end)]
+
+            with np.errstate(divide="ignore", invalid="ignore"):
+                var = np.maximum(s2 - s1 * s1 / n, 0) / (n - 1)
+
+            stats = out[w]
+            stats["mean"][start:stop] = s1 / n + offset
+            stats["std"][start:stop] = np.where(n >= 2, np.sqrt(var), np.nan)
+            stats["entropy"][start:stop] = np.log(n) - c_log_c[counts].sum(axis=-1) / n
+            stats["runs"][start:stop] = np.where(n >= 2, inner_bounds + 1, 0)
+            stats["dominance"][start:stop] = counts.max(axis=-1) - n / DIGIT_BASE
+
+    return out
+
@@ -0,0 +1,100 @@
+import heapq
+
+import numpy as np
+import pandas as pd
+
+DIGIT_COUNT = 6
+DENSE_K_THRESHOLD = 256  # above this k, one vectorized outer sum beats the heap
+
+
+def _log_probs(position_probs) -> np.ndarray:
+    probs = np.asarray(position_probs, dtype=float)
+    if probs.ndim != 2 or probs.shape[1] != 10:
+        raise ValueError("position_probs must have shape (positions, 10)")
+    with np.errstate(divide="ignore"):
+        return np.log(probs)
+
+
+def _top_k_heap(log_probs: np.ndarray, k: int):
+    """
+    Best-first search over per-position digit lists sorted by log-probability.
+    Each pop yields the next best combination; its successors advance one
+    position to that position's next best digit.
+    """
+    order = np.argsort(-log_probs, axis=1, kind="stable")
+    sorted_lp = np.take_along_axis(log_probs, order, axis=1)
+    n_positions = log_probs.shape[0]
+    place = 10 ** np.arange(n_positions - 1, -1, -1)
+
+    def entry(idx):
+        score = sorted_lp[np.arange(n_positions), idx].sum()
+        number = int((order[np.arange(n_positions), idx] * place).sum())
+        return (-score, number, idx)
+
+    start = (0,) * n_positions
+    heap = [entry(start)]
+    seen = {start}
+    numbers, scores = [], []
+
+    while heap and len(numbers) < k:
+        neg_score, number, idx = heapq.heappop(heap)
+        if not np.isfinite(neg_score):
+            break
+        numbers.append(number)
+        scores.append(-neg_score)
+
+        for pos in range(n_positions):
+            if idx[pos] + 1 < 10:
+                child = idx[:pos] + (idx[pos] + 1,) + idx[pos + 1:]
+                if child not in seen:
+                    seen.add(child)
+                    heapq.heappush(heap, entry(child))
+
+    return np.array(numbers, dtype=np.int64), np.array(scores, dtype=float)
+
+
+def _top_k_dense(log_probs: np.ndarray, k: int):
+    """
+    Outer sum of all per-position log-probabilities; the flat C-order index
+    of each cell is the candidate number itself.
+    """
+    total = log_probs[0]
+    for row in log_probs[1:]:
+        total = np.add.outer(total, row)
+    flat = total.ravel()
+
+    k = min(k, int(np.isfinite(flat).sum()))
+    if k == 0:
+        return np.array([], dtype=np.int64), np.array([], dtype=float)
+
+    best = np.argpartition(-flat, k - 1)[:k] if k < flat.size else np.arange(flat.size)
+    # Highest probability first, ties by ascending number
+    best = best[np.lexsort((best, -flat[best]))]
+    return best.astype(np.int64), flat[best]
+
+
+def top_k_numbers(position_probs, k: int = 5, method: str = "auto") -> pd.DataFrame:
+    """
+    Returns the k most likely full numbers given independent per-position
+    digit probabilities of shape (positions, 10), without materialising the
+    Cartesian product of digits. Combinations with zero probability are
+    never returned.
+    - method="heap": best-first search, O(k * positions * log k)
+    - method="dense": vectorized outer sum + argpartition over 10^positions cells
+    - method="auto": heap for small k, dense otherwise
+    """
+    log_probs = _log_probs(position_probs)
+
+    if method == "auto":
+        method = "heap" if k <= DENSE_K_THRESHOLD else "dense"
+    if method == "heap":
+        numbers, scores = _top_k_heap(log_probs, k)
+    elif method == "dense":
+        numbers, scores = _top_k_dense(log_probs, k)
+    else:
+        raise ValueError(f"Unknown method: {method}")
+
+    return pd.DataFrame({
+        "predicted_number": numbers,
+        "probability": np.exp(scores),
+    })
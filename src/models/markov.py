@@ -0,0 +1,142 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def encode_kgrams(symbols: np.ndarray, length: int, alphabet: int) -> np.ndarray:
+    """
+    Encodes every run of `length` consecutive symbols as one base-`alphabet`
+    integer, oldest symbol most significant
+    """
+    symbols = np.asarray(symbols, dtype=np.int64)
+    if len(symbols) < length:
+        return np.zeros(0, dtype=np.int64)
+    powers = alphabet ** np.arange(length - 1, -1, -1, dtype=np.int64)
+    return sliding_window_view(symbols, length) @ powers
+
+
+def encode_kgrams_rows(rows: np.ndarray, alphabet: int) -> np.ndarray:
+    """
+    Encodes each row of an (m, length) symbol array as one integer
+    """
+    powers = alphabet ** np.arange(rows.shape[1] - 1, -1, -1, dtype=np.int64)
+    return rows @ powers
+
+
+def _lookup(keys: np.ndarray, values: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """
+    values[keys == query] for sorted unique `keys`, 0 where the key is absent
+    """
+    if len(keys) == 0:
+        return np.zeros(query.shape, dtype=values.dtype)
+    pos = np.minimum(np.searchsorted(keys, query), len(keys) - 1)
+    return np.where(keys[pos] == query, values[pos], 0)
+
+
+class _OrderCounts:
+    """
+    Sparse (context, next symbol) counts of one order, stored as sorted
+    integer keys context * alphabet + symbol, plus per-context totals and
+    the number of distinct symbols seen after each context
+    """
+
+    def __init__(self, keys: np.ndarray, counts: np.ndarray, alphabet: int):
+        self.keys = keys
+        self.counts = counts
+        contexts = keys // alphabet
+        self.contexts, start = np.unique(contexts, return_index=True)
+        self.totals = np.add.reduceat(counts, start) if len(keys) else counts[:0]
+        self.types = np.diff(np.append(start, len(keys)))
+
+
+class MarkovModel:
+    """
+    Order-k Markov model over a finite alphabet with sparse count storage.
+
+    Only observed k-grams are stored, so memory grows with the data rather
+    than with alphabet ** (k + 1). Smoothing:
+    - "additive": (c + alpha) / (total + alpha * alphabet) at order k
+    - "kneser_ney": interpolated Kneser-Ney with absolute `discount`,
+      backing off through continuation counts down to a uniform distribution
+    """
+
+    def __init__(self, order: int = 1, alphabet: int = 10, smoothing: str = "kneser_ney",
+                 alpha: float = 1.0, discount: float = 0.75):
+        if smoothing not in ("additive", "kneser_ney"):
+            raise ValueError(f"Unknown smoothing: {smoothing}")
+        if alphabet ** (order + 1) >= 2 ** 63:
+            raise ValueError("alphabet ** (order + 1) must fit in int64 keys")
+        self.order = order
+        self.alphabet = alphabet
+        self.smoothing = smoothing
+        self.alpha = alpha
+        self.discount = discount
+        self.levels = []
+
+    def fit(self, sequences) -> "MarkovModel":
+        """
+        Fits on one symbol sequence or a list of them; k-grams never cross
+        sequence boundaries
+        """
+        if isinstance(sequences, np.ndarray) and sequences.ndim == 1:
+            sequences = [sequences]
+        a = self.alphabet
+
+        keys = np.concatenate([
+            encode_kgrams(np.asarray(seq) % a, self.order + 1, a) for seq in sequences
+        ])
+        top_keys, top_counts = np.unique(keys, return_counts=True)
+        levels = [_OrderCounts(top_keys, top_counts, a)]
+
+        # Lower orders use continuation counts: distinct symbols preceding a k-gram
+        for j in range(self.order - 1, -1, -1):
+            shorter = levels[0].keys % (a ** (j + 1))
+            lower_keys, lower_counts = np.unique(shorter, return_counts=True)
+            levels.insert(0, _OrderCounts(lower_keys, lower_counts, a))
+
+        self.levels = levels
+        return self
+
+    def predict_proba(self, contexts) -> np.ndarray:
+        """
+        Next-symbol distributions for a batch of contexts, shape (m, width)
+        with the most recent symbol last. Returns (m, alphabet).
+
+        Only the last `order` symbols are used. Kneser-Ney backs off to
+        the longest available suffix when width < order; additive
+        smoothing has no lower orders and raises ValueError instead.
+        """
+        a = self.alphabet
+        contexts = np.atleast_2d(np.asarray(contexts, dtype=np.int64)) % a
+        width = min(contexts.shape[1], self.order)
+        contexts = contexts[:, contexts.shape[1] - width:]
+        if width < self.order and self.smoothing == "additive":
+            raise ValueError(f"Additive smoothing needs contexts of {self.order} symbols, got {width}")
+        m = contexts.shape[0]
+        symbols = np.arange(a)
+
+        probs = np.full((m, a), 1.0 / a)
+        orders = range(width + 1) if self.smoothing == "kneser_ney" else [self.order]
+        for j in orders:
+            level = self.levels[j]
+            ctx = encode_kgrams_rows(contexts[:, width - j:], a)
+            counts = _lookup(level.keys, level.counts, ctx[:, None] * a + symbols).astype(float)
+            totals = _lookup(level.contexts, level.totals, ctx).astype(float)[:, None]
+
+            with np.errstate(invalid="ignore", divide="ignore"):
+                if self.smoothing == "additive":
+                    probs = (counts + self.alpha) / (totals + self.alpha * a)
+                else:
+                    types = _lookup(level.contexts, level.types, ctx).astype(float)[:, None]
+                    discounted = np.maximum(counts - self.discount, 0) / totals
+                    backoff = self.discount * types / totals
+                    probs = np.where(totals > 0, discounted + backoff * probs, probs)
+        return probs
+
+    def predict_next(self, sequence) -> np.ndarray:
+        """
+        Distribution of the symbol following the end of `sequence`. A
+        sequence shorter than `order` is handled as in `predict_proba`.
+        """
+        sequence = np.asarray(sequence, dtype=np.int64)
+        context = sequence[max(0, len(sequence) - self.order):]
+        return self.predict_proba(context[None, :])[0]
@@ -0,0 +1,112 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from joblib import Parallel, delayed
+from sklearn.ensemble import RandomForestRegressor
+
+from src.utils.profiling import profile_stage
+
+MODEL_DIR = Path("outputs") / "model_registry"
+
+DIGIT_MODEL_PARAMS = {
+    "n_estimators": 300,
+    "max_depth": 12,
+    "random_state": 42,
+}
+
+
+def fingerprint_data(X: pd.DataFrame, y: pd.Series, params: dict) -> str:
+    """
+    Hash of the feature matrix, target and hyperparameters of one model.
+    n_jobs is excluded: it changes speed, not the fitted forest.
+    """
+    h = hashlib.sha256()
+    h.update(json.dumps(list(map(str, X.columns))).encode())
+    h.update(np.ascontiguousarray(X.to_numpy(dtype=float)).tobytes())
+    h.update(np.ascontiguousarray(np.asarray(y, dtype=float)).tobytes())
+    model_params = {k: v for k, v in params.items() if k != "n_jobs"}
+    h.update(json.dumps(model_params, sort_keys=True, default=str).encode())
+    h.update(sklearn.__version__.encode())
+    return h.hexdigest()[:32]
+
+
+def _fit(X, y, params, n_jobs):
+    model = RandomForestRegressor(**{**params, "n_jobs": n_jobs})
+    model.fit(X, y)
+    return model
+
+
+class ModelRegistry:
+    """
+    Fits RandomForest models concurrently under a shared core budget and
+    keeps them in memory and on disk, keyed by data and hyperparameters.
+    """
+
+    def __init__(self, cache_dir: Path = MODEL_DIR, n_jobs: int = -1):
+        self.cache_dir = Path(cache_dir)
+        self.n_jobs = n_jobs
+        self._memory = {}
+
+    def _core_budget(self) -> int:
+        if self.n_jobs is None or self.n_jobs < 1:
+            return os.cpu_count() or 1
+        return self.n_jobs
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.joblib"
+
+    def get_or_fit(self, X: pd.DataFrame, targets: dict, params: dict = None) -> dict:
+        """
+        Returns {target_name: fitted model} for each target series in
+        `targets`, loading cached models and fitting only the missing ones.
+        """
+        params = dict(DIGIT_MODEL_PARAMS if params is None else params)
+        keys = {name: fingerprint_data(X, y, params) for name, y in targets.items()}
+        models = {}
+
+        for name, key in keys.items():
+            if key in self._memory:
+                models[name] = self._memory[key]
+            elif self._path(key).exists():
+                models[name] = self._memory[key] = joblib.load(self._path(key))
+
+        missing = [name for name in targets if name not in models]
+        if missing:
+            budget = self._core_budget()
+            concurrent = min(len(missing), budget)
+            per_model_jobs = max(1, budget // concurrent)
+
+            with profile_stage("fit_models") as stage:
+                stage.output(X)
+                fitted = Parallel(n_jobs=concurrent, prefer="threads")(
+                    delayed(_fit)(X, targets[name], params, per_model_jobs) for name in missing
+                )
+
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            for name, model in zip(missing, fitted):
+                key = keys[name]
+                tmp_path = self._path(key).with_suffix(f".{os.getpid()}.tmp")
+                joblib.dump(model, tmp_path)
+                os.replace(tmp_path, self._path(key))
+                models[name] = self._memory[key] = model
+
+        return models
+
+
+_REGISTRY = None
+
+
+def get_registry() -> ModelRegistry:
+    """
+    Process-wide registry shared by the prediction scripts
+    """
+    global _REGISTRY
+    if _REGISTRY is None:
+        _REGISTRY = ModelRegistry()
+    return _REGISTRY
@@ -0,0 +1,46 @@
+import weakref
+
+import numpy as np
+
+_LEAF_TABLES = weakref.WeakKeyDictionary()
+
+
+def _leaf_table(model):
+    """
+    Concatenated leaf values of every tree in a fitted forest plus the
+    offset of each tree's nodes in that array. Built once per model.
+    """
+    if model not in _LEAF_TABLES:
+        trees = [est.tree_ for est in model.estimators_]
+        node_counts = np.array([tree.node_count for tree in trees])
+        offsets = np.concatenate([[0], np.cumsum(node_counts)[:-1]])
+        values = np.concatenate([tree.value[:, 0, 0] for tree in trees])
+        _LEAF_TABLES[model] = (offsets, values)
+    return _LEAF_TABLES[model]
+
+
+def tree_votes(model, X) -> np.ndarray:
+    """
+    Per-tree predictions of a fitted forest regressor for every row of X,
+    shape (rows, trees). Leaf indices come from one `apply` call and are
+    mapped to values with a single gather.
+    """
+    offsets, values = _leaf_table(model)
+    leaves = model.apply(X)
+    return values[leaves + offsets]
+
+
+def digit_vote_distribution(models, X) -> np.ndarray:
+    """
+    Share of trees voting for each digit 0-9, for every query row and every
+    digit-position model, shape (rows, positions, 10). Tree outputs are
+    rounded to the nearest digit.
+    """
+    distributions = []
+    for model in models:
+        votes = np.clip(np.round(tree_votes(model, X)), 0, 9).astype(np.int64)
+        n_rows, n_trees = votes.shape
+        flat = (np.arange(n_rows)[:, None] * 10 + votes).ravel()
+        counts = np.bincount(flat, minlength=n_rows * 10).reshape(n_rows, 10)
+        distributions.append(counts / n_trees)
+    return np.stack(distributions, axis=1)
@@ -0,0 +1,209 @@
+import contextlib
+import cProfile
+import functools
+import json
+import os
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+# Setting PRIZEBOND_PROFILE=<dir> enables profiling for the whole process
+ENV_REPORT_DIR = "PRIZEBOND_PROFILE"
+ENV_CPROFILE = "PRIZEBOND_PROFILE_CPROFILE"
+ENV_TRACEMALLOC = "PRIZEBOND_PROFILE_TRACEMALLOC"
+
+PROFILE_DIR = Path("outputs") / "profiles"
+
+
+def _process_peak_rss_mb():
+    """
+    Peak resident set size of the whole process so far, not of one stage
+    """
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KB on Linux
+
+
+class StageRecord:
+    """
+    Measurements of one profiled stage. Call `output(df)` to record the
+    shape of the frame the stage produced.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.fields = {"stage": name}
+
+    def output(self, df) -> None:
+        if isinstance(df, pd.DataFrame):
+            self.fields["rows"], self.fields["columns"] = df.shape
+        elif isinstance(df, pd.Series):
+            self.fields["rows"], self.fields["columns"] = len(df), 1
+
+
+class _NullRecord:
+    def output(self, df) -> None:
+        pass
+
+
+_NULL_RECORD = _NullRecord()
+
+
+class Profiler:
+    """
+    Collects per-stage wall time, CPU time and (optionally) the peak
+    tracemalloc memory above the stage's starting point, with an optional
+    cProfile dump per stage. `process_peak_rss_mb` is the process-lifetime
+    RSS peak when the stage ends, so it never drops between stages; use
+    `peak_traced_mb` for the memory a stage itself needed.
+
+    Stages nest; names are joined with "/". A cProfile dump only covers
+    the time spent in a stage outside its nested stages. The JSON report
+    is rewritten every time the outermost stage finishes.
+    """
+
+    def __init__(self, report_dir=PROFILE_DIR, cprofile: bool = False, memory: bool = False):
+        self.report_dir = Path(report_dir)
+        self.cprofile = cprofile
+        self.memory = memory
+        self.run_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        self.records = []
+        self._stack = []
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        if self._stack:
+            name = f"{self._stack[-1]['record'].name}/{name}"
+        record = StageRecord(name)
+        frame = {"record": record, "profile": None, "child_peak": 0}
+
+        if self._stack and self._stack[-1]["profile"] is not None:
+            self._stack[-1]["profile"].disable()
+        if self.cprofile:
+            frame["profile"] = cProfile.Profile()
+        self._stack.append(frame)
+
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            traced_before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        wall, cpu = time.perf_counter(), time.process_time()
+        if frame["profile"] is not None:
+            frame["profile"].enable()
+        try:
+            yield record
+        finally:
+            if frame["profile"] is not None:
+                frame["profile"].disable()
+            record.fields["wall_s"] = time.perf_counter() - wall
+            record.fields["cpu_s"] = time.process_time() - cpu
+            record.fields["process_peak_rss_mb"] = _process_peak_rss_mb()
+            if self.memory:
+                # Nested stages reset the tracemalloc peak, so fold theirs back in
+                peak = max(tracemalloc.get_traced_memory()[1], frame["child_peak"])
+                record.fields["peak_traced_mb"] = (peak - traced_before) / 2 ** 20
+
+            self._stack.pop()
+            if self.memory and self._stack:
+                self._stack[-1]["child_peak"] = max(self._stack[-1]["child_peak"], peak)
+            self.records.append(record.fields)
+            if frame["profile"] is not None:
+                self._dump_profile(frame["profile"], record)
+            if self._stack and self._stack[-1]["profile"] is not None:
+                self._stack[-1]["profile"].enable()
+            if not self._stack:
+                self.write_report()
+
+    def _dump_profile(self, profile: cProfile.Profile, record: StageRecord) -> None:
+        path = self.report_dir / self.run_id / f"{len(self.records):03d}-{record.name.replace('/', '.')}.prof"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        profile.dump_stats(path)
+        record.fields["cprofile"] = str(path)
+
+    def report(self) -> dict:
+        return {
+            "run_id": self.run_id,
+            "pid": os.getpid(),
+            "cprofile": self.cprofile,
+            "tracemalloc": self.memory,
+            "stages": self.records,
+        }
+
+    def write_report(self) -> Path:
+        self.report_dir.mkdir(parents=True, exist_ok=True)
+        path = self.report_dir / f"profile-{self.run_id}.json"
+        with open(path, "w") as f:
+            json.dump(self.report(), f, indent=2)
+        return path
+
+
+# =========================================================
+# Process-wide hook: free when no profiler is active
+# =========================================================
+
+_ACTIVE = None
+
+
+def enable_profiling(report_dir=PROFILE_DIR, cprofile: bool = False, memory: bool = False) -> Profiler:
+    global _ACTIVE
+    _ACTIVE = Profiler(report_dir, cprofile=cprofile, memory=memory)
+    return _ACTIVE
+
+
+def disable_profiling() -> Profiler:
+    global _ACTIVE
+    profiler, _ACTIVE = _ACTIVE, None
+    return profiler
+
+
+def get_profiler() -> Profiler:
+    return _ACTIVE
+
+
+def profile_stage(name: str):
+    """
+    `with profile_stage("rolling") as stage: ...; stage.output(df)`.
+    A no-op context when profiling is disabled.
+    """
+    if _ACTIVE is None:
+        return contextlib.nullcontext(_NULL_RECORD)
+    return _ACTIVE.stage(name)
+
+
+def profiled(name: str = None):
+    """
+    Decorator form of `profile_stage`; a returned DataFrame is recorded
+    as the stage output
+    """
+    def decorate(func):
+        stage_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _ACTIVE is None:
+                return func(*args, **kwargs)
+            with _ACTIVE.stage(stage_name) as stage:
+                result = func(*args, **kwargs)
+                stage.output(result)
+            return result
+
+        return wrapper
+
+    return decorate
+
+
+if os.environ.get(ENV_REPORT_DIR):
+    enable_profiling(
+        os.environ[ENV_REPORT_DIR],
+        cprofile=os.environ.get(ENV_CPROFILE, "") not in ("", "0"),
+        memory=os.environ.get(ENV_TRACEMALLOC, "") not in ("", "0"),
+    )
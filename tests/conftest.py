@@ -0,0 +1,15 @@
+import pytest
+
+from src.benchmarks.synthetic import generate_draws
+
+
+@pytest.fixture(autouse=True)
+def _scratch_dir(tmp_path, monkeypatch):
+    # Code under test writes to outputs/ in the working directory
+    monkeypatch.chdir(tmp_path)
+
+
+@pytest.fixture
+def raw_draws():
+    """300 synthetic raw draws, newest first"""
+    return generate_draws(300, seed=7)
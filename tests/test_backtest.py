@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.clean import clean_data
+from src.data.load import PRIZE_COLS
+from src.evaluation.backtest import BASE_COLS, build_fold_table, training_pairs, walk_forward
+from src.features.digit_features import add_digit_features
+from src.features.predict_next import build_features_for_prize
+
+
+@pytest.fixture
+def train(raw_draws):
+    return clean_data(raw_draws).sort_values("draw_date").reset_index(drop=True).iloc[:80]
+
+
+def _fold_pairs(table, window):
+    digit_cols = [col for col in table.columns if col not in BASE_COLS]
+    for col in PRIZE_COLS:
+        yield training_pairs(table, build_features_for_prize(table, col, window), col)
+        yield training_pairs(table, digit_cols, f"{col}_d6")
+
+
+def test_no_feature_column_equals_the_label(train):
+    window = 10
+    table = add_digit_features(build_fold_table(train, window))
+    for X, y, X_query in _fold_pairs(table, window):
+        for col in X.columns:
+            values = X[col].to_numpy(dtype=float)
+            assert not np.array_equal(values, y), col
+            assert not np.array_equal(values, y % 10), col
+        assert not X_query.isna().any().any()
+
+
+def test_features_do_not_depend_on_the_next_draw(train):
+    table = add_digit_features(build_fold_table(train, 10))
+
+    changed = train.copy()
+    changed.loc[len(changed) - 1, PRIZE_COLS] = (changed.loc[len(changed) - 1, PRIZE_COLS] + 1) % 1_000_000
+    changed_table = add_digit_features(build_fold_table(changed, 10))
+
+    cols = [col for col in table.columns if col not in BASE_COLS]
+    # Every row but the newest keeps its features when the newest draw (its label) changes
+    pd.testing.assert_frame_equal(table[cols].iloc[:-1], changed_table[cols].iloc[:-1])
+
+
+def test_walk_forward_scores_every_fold(raw_draws):
+    per_fold, summary = walk_forward(clean_data(raw_draws.iloc[:60]), predictors=["predict_next_top5"],
+                                     min_train=40, n_jobs=1)
+    assert len(per_fold) == 20 * len(PRIZE_COLS)
+    assert summary["folds"].eq(20).all()
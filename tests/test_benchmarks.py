@@ -0,0 +1,15 @@
+from src.benchmarks.run_benchmarks import BenchmarkInputs
+
+
+def test_release_keeps_only_what_later_cases_read(tmp_path):
+    inputs = BenchmarkInputs(50, tmp_path)
+    inputs.get("anomaly")
+    assert set(inputs._frames) == {"raw", "clean", "rolling", "transition", "anomaly"}
+
+    # digits is not built yet, so the anomaly frame it is built from stays
+    inputs.release(["transition", "digits"])
+    assert set(inputs._frames) == {"transition", "anomaly"}
+
+    inputs.get("digits")
+    inputs.release(["digits"])
+    assert set(inputs._frames) == {"digits"}
@@ -0,0 +1,43 @@
+import pandas as pd
+import pytest
+
+from src.data.clean import clean_data
+from src.features import feature_state
+from src.features.combined_features import compute_feature_table
+from src.features.feature_state import FeatureState
+
+
+@pytest.mark.parametrize("window", [3, 10])
+def test_ingest_matches_full_rebuild(raw_draws, window):
+    state = FeatureState.from_clean_data(clean_data(raw_draws.iloc[10:]), window=window)
+    for batch in ([9], [8, 7, 6], [5, 4, 3, 2, 1, 0]):
+        state.ingest(raw_draws.iloc[batch])
+
+    expected = compute_feature_table(clean_data(raw_draws), window=window)
+    pd.testing.assert_frame_equal(state.table, expected, rtol=1e-9)
+
+
+def test_ingest_grows_buffers(raw_draws, monkeypatch):
+    monkeypatch.setattr(feature_state, "MIN_CAPACITY", 1)
+    state = FeatureState.from_clean_data(clean_data(raw_draws.iloc[280:]), window=5)
+    for start in range(270, -10, -10):
+        state.ingest(raw_draws.iloc[start:start + 10])
+
+    expected = compute_feature_table(clean_data(raw_draws), window=5)
+    pd.testing.assert_frame_equal(state.table, expected, rtol=1e-9)
+
+
+def test_ingest_rejects_older_draws(raw_draws):
+    state = FeatureState.from_clean_data(clean_data(raw_draws.iloc[:100]))
+    with pytest.raises(ValueError):
+        state.ingest(raw_draws.iloc[[150]])
+
+
+def test_saved_state_keeps_ingesting(raw_draws, tmp_path):
+    state = FeatureState.from_clean_data(clean_data(raw_draws.iloc[2:]))
+    state.ingest(raw_draws.iloc[[1]])
+    state.save(tmp_path / "state.pkl")
+
+    state = FeatureState.load(tmp_path / "state.pkl")
+    state.ingest(raw_draws.iloc[[0]])
+    pd.testing.assert_frame_equal(state.table, compute_feature_table(clean_data(raw_draws)), rtol=1e-9)
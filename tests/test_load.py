@@ -0,0 +1,44 @@
+import pytest
+
+from src.data.load import load_dataset
+
+
+def _write(df, name):
+    path = f"prize_bond_{name}.csv"
+    df.to_csv(path, index=False)
+    return path
+
+
+def test_loads_several_denominations(raw_draws):
+    df = load_dataset([_write(raw_draws, 750), _write(raw_draws, 1500)], chunksize=64)
+    assert len(df) == 2 * len(raw_draws)
+    assert df["draw_date"].is_monotonic_decreasing
+
+
+@pytest.mark.parametrize("clean", [True, False])
+def test_rejects_a_draw_number_repeated_in_another_chunk(raw_draws, clean):
+    draws = raw_draws.copy()
+    # Rows 63 and 64 straddle the first chunk boundary
+    draws.loc[64, "Draw No."] = draws.loc[63, "Draw No."]
+    path = _write(draws, 750)
+
+    with pytest.raises(AssertionError, match="Duplicate draw numbers"):
+        load_dataset(path, chunksize=64, clean=clean)
+    with pytest.raises(AssertionError, match="Duplicate draw numbers"):
+        list(load_dataset(path, chunksize=64, clean=clean, iterator=True))
+
+
+def test_rejects_draw_numbers_out_of_file_order(raw_draws):
+    draws = raw_draws.copy()
+    draws.loc[[10, 200], "Draw No."] = draws.loc[[200, 10], "Draw No."].to_numpy()
+
+    with pytest.raises(AssertionError, match="not in file order"):
+        list(load_dataset(_write(draws, 750), chunksize=64, iterator=True))
+
+
+def test_rejects_draw_numbers_out_of_date_order(raw_draws):
+    draws = raw_draws.copy()
+    draws.loc[[10, 200], "Date"] = draws.loc[[200, 10], "Date"].to_numpy()
+
+    with pytest.raises(AssertionError, match="increase with the draw date"):
+        load_dataset(_write(draws, 750), chunksize=64)
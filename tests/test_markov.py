@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from src.models.markov import MarkovModel
+
+
+@pytest.fixture
+def cycle():
+    return np.tile(np.arange(10), 50)
+
+
+def test_short_sequence_backs_off_to_the_available_suffix(cycle):
+    model = MarkovModel(order=3).fit(cycle)
+    for symbol in range(10):
+        probs = model.predict_next([symbol])
+        assert probs.sum() == pytest.approx(1.0)
+        assert probs.argmax() == (symbol + 1) % 10
+    np.testing.assert_allclose(model.predict_next([3, 4]), model.predict_proba([[3, 4]])[0])
+
+
+def test_full_context_uses_the_last_order_symbols(cycle):
+    model = MarkovModel(order=2).fit(cycle)
+    np.testing.assert_allclose(model.predict_next(cycle[:7]), model.predict_proba([cycle[5:7]])[0])
+
+
+def test_additive_smoothing_rejects_short_sequences(cycle):
+    model = MarkovModel(order=3, smoothing="additive").fit(cycle)
+    assert model.predict_next(cycle[:3]).argmax() == 3
+    with pytest.raises(ValueError):
+        model.predict_next([1])
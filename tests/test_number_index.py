@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data import number_index
+from src.data.clean import clean_data
+from src.data.load import PRIZE_COLS
+from src.data.number_index import WinningNumberIndex
+
+
+@pytest.fixture
+def draws(raw_draws):
+    return clean_data(raw_draws)
+
+
+def _wins(draws, number):
+    hits = draws[PRIZE_COLS].to_numpy() == number
+    return sorted(zip(np.repeat(draws["draw_no"].to_numpy(), 4)[hits.ravel()],
+                      np.tile(PRIZE_COLS, len(draws))[hits.ravel()]))
+
+
+def _postings(index):
+    return index.range_lookup(0, 999_999).sort_values(["number", "draw_no", "prize"], ignore_index=True)
+
+
+def test_lookup_and_counts_match_the_draws(draws):
+    index = WinningNumberIndex.build(draws, "index")
+    number = int(draws["first_prize"].iloc[5])
+
+    found = index.lookup(number)
+    assert sorted(zip(found["draw_no"], found["prize"])) == _wins(draws, number)
+    assert index.count(number) == len(_wins(draws, number))
+    assert not index.has_won(np.setdiff1d(np.arange(1000), draws[PRIZE_COLS].to_numpy())).any()
+    assert index.range_count(0, 999_999) == 4 * len(draws)
+    assert index.range_count(0, 499_999) == int((draws[PRIZE_COLS].to_numpy() < 500_000).sum())
+
+
+def test_append_and_compact_equal_a_full_build(draws):
+    full = WinningNumberIndex.build(draws, "full")
+    index = WinningNumberIndex.build(draws.iloc[100:], "index")
+    index.append(draws.iloc[50:100])
+    index.append(draws.iloc[:50])
+
+    assert index.range_count(0, 999_999) == 4 * len(draws)
+    np.testing.assert_array_equal(index.counts, full.counts)
+    pd.testing.assert_frame_equal(_postings(index), _postings(full))
+
+    index.compact()
+    assert len(index.delta_number) == 0
+    np.testing.assert_array_equal(index.offsets, full.offsets)
+    np.testing.assert_array_equal(WinningNumberIndex.open("index").counts, full.counts)
+
+
+def test_append_past_the_threshold_compacts(draws, monkeypatch):
+    monkeypatch.setattr(number_index, "COMPACT_THRESHOLD", 40)
+    index = WinningNumberIndex.build(draws.iloc[20:], "index")
+    index.append(draws.iloc[:20])
+    assert len(index.delta_number) == 0
+    assert index.range_count(0, 999_999) == 4 * len(draws)
+
+
+def test_append_rejects_indexed_draws(draws):
+    index = WinningNumberIndex.build(draws.iloc[10:], "index")
+    with pytest.raises(ValueError, match="already indexed"):
+        index.append(draws.iloc[5:15])
+    with pytest.raises(ValueError, match="already indexed"):
+        index.append(pd.concat([draws.iloc[:1], draws.iloc[:1]]))
+    assert index.range_count(0, 999_999) == 4 * (len(draws) - 10)
+
+
+def test_open_rebuilds_counts_left_behind_by_an_interrupted_append(draws):
+    index = WinningNumberIndex.build(draws, "index")
+    index.counts[:] = 0
+    index.counts.flush()
+    del index
+
+    np.testing.assert_array_equal(WinningNumberIndex.open("index").counts,
+                                  WinningNumberIndex.build(draws, "full").counts)
+
+
+def test_main_builds_and_queries(raw_draws, capsys):
+    raw_draws.to_csv("draws.csv", index=False)
+    number_index.main(["--index", "index", "build", "--data", "draws.csv"])
+    number = int(raw_draws["1st"].iloc[0])
+    number_index.main(["--index", "index", "lookup", str(number)])
+    assert str(number) in capsys.readouterr().out
@@ -0,0 +1,16 @@
+from src.features.feature_store import module_sources
+from src.features.pipeline import FeaturePipeline
+
+
+def test_stage_fingerprints_cover_imported_modules():
+    stages = FeaturePipeline().stages
+    assert {"src/features/transition_features.py", "src/features/digit_features.py",
+            "src/features/feature_block.py"} <= set(stages["transition"].code_files)
+    for name in ["rolling", "transition", "anomaly", "digits"]:
+        assert "src/features/feature_block.py" in stages[name].code_files
+    assert stages["load"].code_files == tuple(module_sources("src.data.load"))
+
+
+def test_module_sources_follow_imported_constants():
+    # schema.py only imports PRIZE_COLS from src.data.load
+    assert "src/data/load.py" in module_sources("src.features.schema")
@@ -0,0 +1,36 @@
+import numpy as np
+
+from src.data.clean import clean_data
+from src.data.load import PRIZE_COLS
+from src.features.pipeline import FeaturePipeline
+from src.features.transition_features import (
+    add_positional_transition_features,
+    add_transition_features,
+    transition_feature_columns,
+)
+
+
+def test_last_position_matches_the_last_digit_transitions(raw_draws):
+    df = add_positional_transition_features(add_transition_features(clean_data(raw_draws)))
+    for col in PRIZE_COLS:
+        for name in ["transition_prob", "transition_surprise"]:
+            np.testing.assert_array_equal(df[f"{col}_d6_{name}"], df[f"{col}_{name}"])
+
+
+def test_digits_stage_has_positional_columns(raw_draws):
+    raw_draws.to_csv("draws.csv", index=False)
+    df = FeaturePipeline(data_path="draws.csv", use_disk=False).run("digits")
+    expected = {f"{col}_d{k}_transition_{name}" for col in PRIZE_COLS for k in range(1, 7)
+                for name in ["prob", "surprise"]}
+    assert expected <= set(df.columns)
+    assert df[sorted(expected)].iloc[1:].notna().all().all()
+
+
+def test_prefix_probabilities_use_earlier_draws_only(raw_draws):
+    values = clean_data(raw_draws)[PRIZE_COLS].to_numpy()[::-1][:60]
+    prefix = transition_feature_columns(values, prefix=True)
+    for j in [1, 2, 30, 59]:
+        # Row j's probabilities match the full estimate over draws 0..j
+        full = transition_feature_columns(values[:j + 1])
+        for col in PRIZE_COLS:
+            assert prefix[f"{col}_transition_prob"][j] == full[f"{col}_transition_prob"][j]
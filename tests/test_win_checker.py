@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.clean import clean_data
+from src.data.win_checker import WinMatcher, check_holdings, file_parts, holdings_layout
+
+
+@pytest.fixture
+def draws(raw_draws):
+    return clean_data(raw_draws)
+
+
+@pytest.fixture
+def numbers(draws):
+    rng = np.random.default_rng(3)
+    winners = draws["first_prize"].to_numpy()[:20]
+    return np.concatenate([winners, rng.integers(0, 1_000_000, 500)])
+
+
+def _matches(draws, paths, **kwargs):
+    total, matches = check_holdings(paths, draws=draws, n_jobs=1, **kwargs)
+    return total, matches.drop(columns="holdings_file")
+
+
+def test_headerless_and_headered_files_match_the_same_bonds(draws, numbers):
+    pd.DataFrame({"bond_number": numbers}).to_csv("headered.csv", index=False)
+    pd.DataFrame({"bond_number": numbers}).to_csv("headerless.csv", index=False, header=False)
+
+    total, headered = _matches(draws, ["headered.csv"])
+    total_headerless, headerless = _matches(draws, ["headerless.csv"])
+
+    assert total == total_headerless == len(numbers)
+    assert set(headered["bond_number"]) >= set(numbers[:20])
+    pd.testing.assert_frame_equal(headered, headerless)
+
+
+def test_headerless_file_keeps_extra_columns(draws, numbers):
+    pd.DataFrame({"n": numbers[:20], "owner": "a"}).to_csv("holdings.csv", index=False, header=False)
+
+    assert holdings_layout("holdings.csv") == (["bond_number", "column_1"], 0)
+    _, matches = _matches(draws, ["holdings.csv"])
+    assert set(matches["bond_number"]) == set(numbers[:20])
+    assert (matches["column_1"] == "a").all()
+
+
+def test_file_parts_cover_every_line_once(numbers):
+    pd.DataFrame({"bond_number": numbers}).to_csv("holdings.csv", index=False)
+    names, start = holdings_layout("holdings.csv")
+    parts = file_parts("holdings.csv", start, part_bytes=100)
+
+    assert len(parts) > 1
+    matcher = WinMatcher(pd.DataFrame({"draw_no": [1], "draw_date": [pd.Timestamp(0)],
+                                       "city": ["x"], "first_prize": [0], "second_prize_1": [0],
+                                       "second_prize_2": [0], "second_prize_3": [0]}))
+    rows = sum(n for part in parts for n, _ in matcher.match_file("holdings.csv", part=part))
+    assert rows == len(numbers)
+
+
+def test_a_single_file_is_split_across_workers(draws, numbers):
+    pd.DataFrame({"bond_number": numbers}).to_csv("holdings.csv", index=False)
+
+    expected = _matches(draws, ["holdings.csv"])
+    total, matches = check_holdings(["holdings.csv"], draws=draws, n_jobs=2, chunksize=50)
+
+    assert total == expected[0]
+    pd.testing.assert_frame_equal(matches.drop(columns="holdings_file"), expected[1])